@@ -44,7 +44,8 @@ async def get_latest_errors(
             limit=limit,
             offset=0,
             order_by="started_at",
-            order_direction="desc"
+            order_direction="desc",
+            include_total=True
         )
         
         if not result["success"]:
@@ -114,6 +115,7 @@ async def get_job_detail(
 async def get_job_logs(
     limit: int = Query(100, description="Number of records to fetch", ge=1, le=1000),
     offset: int = Query(0, description="Number of records to skip", ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces offset"),
     status: Optional[str] = Query(None, description="Filter by job status (SUCCESS, FAILED, IN_PROGRESS)"),
     job_type: Optional[str] = Query(None, description="Filter by job type (DELETE, ARCHIVE, OTHER)"),
     table_name: Optional[str] = Query(None, description="Filter by table name"),
@@ -128,6 +130,7 @@ async def get_job_logs(
     Args:
         limit: Maximum number of records to return
         offset: Number of records to skip for pagination
+        cursor: Keyset cursor from the previous page (no total_count is returned)
         status: Filter by job status
         job_type: Filter by job type
         table_name: Filter by table name
@@ -160,7 +163,9 @@ async def get_job_logs(
             limit=limit,
             offset=offset,
             order_by="started_at",
-            order_direction="desc"
+            order_direction="desc",
+            cursor=cursor,
+            include_total=True
         )
         
         if not result["success"]:
@@ -170,6 +175,8 @@ async def get_job_logs(
         
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching job logs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
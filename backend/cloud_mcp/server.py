@@ -644,7 +644,8 @@ async def _query_job_logs(
                 limit=limit,
                 offset=offset,
                 order_by=order_by,
-                order_direction=order_direction
+                order_direction=order_direction,
+                include_total=True
             )
             
             if not result.get('success'):
@@ -1647,7 +1648,8 @@ async def _get_filtered_dsi_logs(
     app_id: str = None,
     period: str = "last 7 days",
     has_errors_only: bool = False,
-    limit: int = 100
+    limit: int = 100,
+    include_total: bool = False
 ) -> Dict[str, Any]:
     """Get DSI logs filtered by multiple criteria"""
     try:
@@ -1658,7 +1660,7 @@ async def _get_filtered_dsi_logs(
         
         try:
             stats_service = DSIStatsService(db)
-            result = await stats_service.get_filtered_logs(instance_id, user_id, app_id, period, has_errors_only, limit)
+            result = await stats_service.get_filtered_logs(instance_id, user_id, app_id, period, has_errors_only, limit, include_total)
             return result
         finally:
             db.close()
@@ -1737,7 +1739,7 @@ async def mcp_query_job_logs(
     - zero_records_only: bool
     - has_records_only: bool
     
-    Available order_by fields: id, job_type, table_name, status, records_affected, started_at, finished_at
+    Available order_by fields: id, job_type, table_name, status, source, records_affected, started_at, finished_at
     order_direction: 'asc' or 'desc'
     """
     return await _query_job_logs(filters, limit, offset, order_by, order_direction)
@@ -1879,7 +1881,8 @@ async def mcp_get_filtered_dsi_logs(
     app_id: str = None,
     period: str = "last 7 days",
     has_errors_only: bool = False,
-    limit: int = 100
+    limit: int = 100,
+    include_total: bool = False
 ) -> Dict[str, Any]:
     """Get DSI logs filtered by multiple criteria
     
@@ -1890,10 +1893,11 @@ async def mcp_get_filtered_dsi_logs(
     - period: Time period like 'last 7 days', 'last week', 'last month'
     - has_errors_only: If True, return only logs with errors (default False)  
     - limit: Maximum number of logs to return (default 100)
+    - include_total: If True, also count every matching log as total_matched (default False)
     
     Returns filtered transaction logs based on the specified criteria.
     """
-    return await _get_filtered_dsi_logs(instance_id, user_id, app_id, period, has_errors_only, limit)
+    return await _get_filtered_dsi_logs(instance_id, user_id, app_id, period, has_errors_only, limit, include_total)
 
 archive_records = _archive_records  
 delete_archived_records = _delete_archived_records
@@ -17,6 +17,8 @@ engine = create_engine(
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
+    # Room for every archive/stats statement shape in the compiled SQL cache
+    query_cache_size=1200,
     echo=False
 )
 
@@ -1,5 +1,5 @@
 """Activities model"""
-from sqlalchemy import Column, Integer, String, TIMESTAMP, text
+from sqlalchemy import Column, Index, Integer, String, TIMESTAMP, text
 from sqlalchemy.ext.declarative import declarative_base
 from database import Base
 
@@ -33,6 +33,10 @@ class DSIActivities(Base):
 
 class ArchiveDSIActivities(Base):
     __tablename__ = "dsiactivitiesarchive"
+    # Backs the (ActivityID, PostedTime) duplicate check when archiving
+    __table_args__ = (
+        Index("ix_dsiactivitiesarchive_activity_posted", "ActivityID", "PostedTime"),
+    )
     
     SequenceID = Column(Integer, primary_key=True, autoincrement=True)
     ActivityID = Column(String(50))
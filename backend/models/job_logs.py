@@ -1,10 +1,30 @@
 """Job Logs model for tracking database operations"""
-from sqlalchemy import Column, Integer, String, Text, DateTime, BigInteger
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, BigInteger, event, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.sql import func
 from database import Base
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    """Whether the pg_trgm extension providing gin_trgm_ops is available"""
+    return bind.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
 
 class JobLogs(Base):
     __tablename__ = "job_logs"
+    # Newest-first listings and keyset cursors walk (started_at, id); status filters
+    # such as failed_only narrow the same range through the status index
+    __table_args__ = (
+        Index("ix_job_logs_started_id", "started_at", "id"),
+        Index("ix_job_logs_status_started", "status", "started_at"),
+        # Trigram index so reason_contains (ILIKE '%term%') can use an index on Postgres;
+        # skipped when pg_trgm is not installed
+        Index(
+            "ix_job_logs_reason_trgm", "reason",
+            postgresql_using="gin", postgresql_ops={"reason": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql", callable_=_pg_trgm_installed),
+    )
     
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     schema_name = Column(String(100), nullable=True)  # Optional, for multi-schema jobs
@@ -18,4 +38,19 @@ class JobLogs(Base):
     finished_at = Column(DateTime, nullable=True)     # When job finished
     
     def __repr__(self):
-        return f"<JobLogs(id={self.id}, job_type='{self.job_type}', table_name='{self.table_name}', status='{self.status}', source='{self.source}')>"
\ No newline at end of file
+        return f"<JobLogs(id={self.id}, job_type='{self.job_type}', table_name='{self.table_name}', status='{self.status}', source='{self.source}')>"
+
+@event.listens_for(JobLogs.__table__, "before_create")
+def _create_pg_trgm_extension(target, connection, **kw):
+    """Try to install pg_trgm for the reason trigram index.
+    
+    Roles without privileges to create extensions still get the table, just without
+    the trigram index; a superuser can run CREATE EXTENSION pg_trgm later.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as e:
+        logger.warning(f"Could not create pg_trgm extension, skipping job_logs reason trigram index: {e}")
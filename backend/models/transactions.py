@@ -1,9 +1,15 @@
 """Transaction model"""
-from sqlalchemy import Column, Integer, String, TIMESTAMP, DECIMAL, text, TEXT
+from sqlalchemy import Column, Index, Integer, String, TIMESTAMP, DECIMAL, text, TEXT
 from database import Base
 
 class DSITransactionLog(Base):
     __tablename__ = "dsitransactionlog"
+    # Range scans on WhenReceived, optionally narrowed by device and user, back the DSI stats queries
+    __table_args__ = (
+        Index("ix_dsitransactionlog_when_received", "WhenReceived"),
+        Index("ix_dsitransactionlog_device_when", "DeviceID", "WhenReceived"),
+        Index("ix_dsitransactionlog_device_user_when", "DeviceID", "UserID", "WhenReceived"),
+    )
     
     RecordID = Column(Integer, primary_key=True, autoincrement=True)
     RecordStatus = Column(String(1))
@@ -42,6 +48,12 @@ class DSITransactionLog(Base):
 
 class ArchiveDSITransactionLog(Base):
     __tablename__ = "dsitransactionlogarchive"
+    # Range scans on WhenReceived, optionally narrowed by device and user, back the DSI stats queries
+    __table_args__ = (
+        Index("ix_dsitransactionlogarchive_when_received", "WhenReceived"),
+        Index("ix_dsitransactionlogarchive_device_when", "DeviceID", "WhenReceived"),
+        Index("ix_dsitransactionlogarchive_device_user_when", "DeviceID", "UserID", "WhenReceived"),
+    )
     
     RecordID = Column(Integer, primary_key=True, autoincrement=True)
     RecordStatus = Column(String(1))
@@ -15,6 +15,44 @@ logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Static permission matrix per role
+_ROLE_PERMISSIONS = {
+    "Admin": {
+        "select": True,
+        "archive": True,
+        "delete_archive": True,
+        "confirm_operations": True
+    },
+    "Monitor": {
+        "select": True,
+        "archive": False,
+        "delete_archive": False,
+        "confirm_operations": False
+    }
+}
+
+_NO_PERMISSIONS = {
+    "select": False,
+    "archive": False,
+    "delete_archive": False,
+    "confirm_operations": False
+}
+
+# Operation names accepted by check_permission mapped to permission keys
+_OPERATION_MAP = {
+    "SELECT": "select",
+    "ARCHIVE": "archive",
+    "DELETE": "delete_archive",
+    "CONFIRM": "confirm_operations"
+}
+
+# (role, operation) -> allowed, resolved once so permission checks are a single lookup
+_OPERATION_PERMISSIONS = {
+    (role, operation): permissions[permission_key]
+    for role, permissions in _ROLE_PERMISSIONS.items()
+    for operation, permission_key in _OPERATION_MAP.items()
+}
+
 class AuthService:
     def __init__(self):
         self.secret_key = os.getenv("SECRET_KEY", "your-secret-key-change-in-production-environment")
@@ -74,41 +112,11 @@ class AuthService:
     
     def get_role_permissions(self, role: str) -> Dict[str, bool]:
         """Get permissions for a role"""
-        if role == "Admin":
-            return {
-                "select": True,
-                "archive": True,
-                "delete_archive": True,
-                "confirm_operations": True
-            }
-        elif role == "Monitor":
-            return {
-                "select": True,
-                "archive": False,
-                "delete_archive": False,
-                "confirm_operations": False
-            }
-        else:
-            return {
-                "select": False,
-                "archive": False,
-                "delete_archive": False,
-                "confirm_operations": False
-            }
+        return dict(_ROLE_PERMISSIONS.get(role, _NO_PERMISSIONS))
     
     def check_permission(self, user_role: str, operation: str) -> bool:
         """Check if user role has permission for operation"""
-        permissions = self.get_role_permissions(user_role)
-        
-        operation_map = {
-            "SELECT": "select",
-            "ARCHIVE": "archive",
-            "DELETE": "delete_archive",
-            "CONFIRM": "confirm_operations"
-        }
-        
-        permission_key = operation_map.get(operation.upper())
-        return permissions.get(permission_key, False)
+        return _OPERATION_PERMISSIONS.get((user_role, operation.upper()), False)
     
     def create_access_token(self, user_data: dict) -> str:
         """Create JWT access token"""
@@ -1,9 +1,14 @@
 """Enhanced CRUD operations service with full DELETE functionality"""
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func, and_, or_
-from typing import Dict, List, Optional, Any, Tuple
+from sqlalchemy import text, func, select, and_, or_
+from sqlalchemy.sql.elements import TextClause
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
+import asyncio
 import logging
+import time
 
 from models import (
     DSIActivities, DSITransactionLog, ArchiveDSIActivities, ArchiveDSITransactionLog
@@ -14,13 +19,344 @@ from schemas import ParsedOperation
 
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class _TableSpec:
+    """Archive layout of a main table"""
+    archive_name: str
+    time_field: str
+    main_columns: Tuple[str, ...]
+    unique_key: Tuple[str, ...]
+    # Integer primary key of the main table, used to walk it in chunks
+    primary_key: str
+    # Whether the archive table enforces unique_key with a unique index
+    unique_in_archive: bool
+    # Identifying columns shown in preview samples
+    preview_columns: Tuple[str, ...]
+
+
+# Archivable main tables; columns are copied from the main table into its archive table
+_TABLE_SPECS = {
+    "dsiactivities": _TableSpec(
+        archive_name="dsiactivitiesarchive",
+        time_field="PostedTime",
+        main_columns=(
+            "ActivityID", "ActivityType", "TrackingID", "SecondaryTrackingID", 
+            "AgentName", "ThreadID", "Description", "PostedTime", "PostedTimeUTC",
+            "LineNumber", "FileName", "MethodName", "ServerName", "InstanceID",
+            "IdenticalAlertCount", "AlertLevel", "DismissedBy", "DismissedDateTime",
+            "LastIdenticalAlertDateTime", "EventID", "DefaultDescription", "ExceptionMessage"
+        ),
+        unique_key=("ActivityID", "PostedTime"),
+        primary_key="SequenceID",
+        unique_in_archive=False,
+        preview_columns=("ActivityID", "PostedTime", "ServerName", "AgentName", "Description")
+    ),
+    "dsitransactionlog": _TableSpec(
+        archive_name="dsitransactionlogarchive",
+        time_field="WhenReceived",
+        main_columns=(
+            "RecordStatus", "ProcessMethod", "TransactionType", "ServerName", "DeviceID", 
+            "UserID", "DeviceLocalTime", "DeviceUTCTime", "DeviceSequenceID", "WhenReceived",
+            "WhenProcessed", "WhenExtracted", "ElapsedTime", "AppID", "AppVersion", "AppItemID",
+            "WorldHostID", "ConnectorID", "FunctionDefVersion", "FunctionCallID", "FunctionCallRC",
+            "DataIn", "DataOut", "ErrorsOut", "SecurityID", "GUID", "UnitID", "PromotionLevelID",
+            "EnvironmentID", "Marking", "OrgUnitID", "TrackingReference"
+        ),
+        unique_key=("GUID",),
+        primary_key="RecordID",
+        unique_in_archive=True,
+        preview_columns=("GUID", "WhenReceived", "UserID", "DeviceID", "TransactionType")
+    )
+}
+
+_ARCHIVE_TABLES = frozenset(spec.archive_name for spec in _TABLE_SPECS.values())
+
+# (main, archive) model classes per table; archive tables act as both main and archive
+_MODEL_CLASSES = {
+    "dsiactivities": (DSIActivities, ArchiveDSIActivities),
+    "dsitransactionlog": (DSITransactionLog, ArchiveDSITransactionLog),
+    "dsiactivitiesarchive": (ArchiveDSIActivities, ArchiveDSIActivities),
+    "dsitransactionlogarchive": (ArchiveDSITransactionLog, ArchiveDSITransactionLog)
+}
+
+# Models carrying the transaction log entity columns, resolved once instead of hasattr per query
+_ALL_MODELS = frozenset(model for models in _MODEL_CLASSES.values() for model in models)
+_MODELS_WITH_USER_ID = frozenset(model for model in _ALL_MODELS if hasattr(model, "UserID"))
+_MODELS_WITH_DEVICE_ID = frozenset(model for model in _ALL_MODELS if hasattr(model, "DeviceID"))
+
+# Entity filter handlers (query, model_class, value) -> query, applied only for keys present
+_FILTER_HANDLERS = {
+    "agent_name": lambda query, model, value: query.filter(model.AgentName == value),
+    "server_name": lambda query, model, value: query.filter(model.ServerName == value),
+    "user_id": lambda query, model, value: (
+        query.filter(model.UserID == value) if model in _MODELS_WITH_USER_ID else query
+    ),
+    "device_id": lambda query, model, value: (
+        query.filter(model.DeviceID == value) if model in _MODELS_WITH_DEVICE_ID else query
+    )
+}
+
+# Preview sample columns, keyed by both main and archive table names
+_PREVIEW_COLUMNS = {
+    name: spec.preview_columns
+    for table, spec in _TABLE_SPECS.items()
+    for name in (table, spec.archive_name)
+}
+
+# Column lists spliced into the archive INSERT ... SELECT, joined once at import
+_ARCHIVE_COLUMN_LISTS = {table: ", ".join(spec.main_columns) for table, spec in _TABLE_SPECS.items()}
+
+# Dialects that can skip unique-key conflicts in-line (INSERT IGNORE / ON CONFLICT DO NOTHING)
+_CONFLICT_SKIPPING_DIALECTS = frozenset({"mysql", "mariadb", "postgresql"})
+
+# Filter keys that shape the archive WHERE clause
+_ARCHIVE_FILTER_KEYS = ("date_start", "date_end", "agent_name", "server_name", "user_id", "device_id")
+
+# Archive preview counts, reused as the candidate count when the same archive is confirmed
+_PREVIEW_COUNT_TTL_SECONDS = 120
+_PREVIEW_COUNT_MAX_ENTRIES = 256
+_preview_counts: Dict[Tuple, Tuple[float, int]] = {}
+
+def _preview_count_key(operation: ParsedOperation, user_id: str) -> Optional[Tuple]:
+    """Key an archive preview by table, filters and user (None if the filters are unhashable)"""
+    try:
+        return (operation.table, frozenset(operation.filters.items()), user_id)
+    except TypeError:
+        return None
+
+def _get_preview_count(key: Optional[Tuple]) -> Optional[int]:
+    """Return a cached preview count that has not expired"""
+    entry = _preview_counts.get(key) if key is not None else None
+    if entry is None:
+        return None
+    stored_at, count = entry
+    if time.monotonic() - stored_at > _PREVIEW_COUNT_TTL_SECONDS:
+        _preview_counts.pop(key, None)
+        return None
+    return count
+
+def _store_preview_count(key: Optional[Tuple], count: int) -> None:
+    """Cache a preview count, evicting the oldest entry when full"""
+    if key is None:
+        return
+    _preview_counts.pop(key, None)
+    if len(_preview_counts) >= _PREVIEW_COUNT_MAX_ENTRIES:
+        _preview_counts.pop(next(iter(_preview_counts)), None)
+    _preview_counts[key] = (time.monotonic(), count)
+
+@lru_cache(maxsize=256)
+def _parse_filter_date(date_str: str) -> Optional[datetime]:
+    """Parse the YYYYMMDD prefix of a YYYYMMDDHHMMSS filter value.
+    
+    Returns None when the value is too short; raises ValueError when malformed.
+    """
+    if len(date_str) < 8:
+        return None
+    return datetime.strptime(date_str[:8], "%Y%m%d")
+
+class _ArchiveStatements(NamedTuple):
+    """Statements for one archive filter shape"""
+    count: TextClause
+    insert: TextClause
+    delete: TextClause
+    # Finds the upper primary key of the next chunk; None when the archive is limited
+    chunk_upper_bound: Optional[TextClause]
+    # Single DELETE ... RETURNING -> INSERT statement replacing insert + delete (PostgreSQL only)
+    move: Optional[TextClause] = None
+
+@lru_cache(maxsize=64)
+def _build_archive_statements(
+    main_table: str,
+    filter_keys: frozenset,
+    date_comparison: Optional[str],
+    limited: bool,
+    dialect: str
+) -> _ArchiveStatements:
+    """Build the archive statements for one filter shape.
+    
+    The SQL only depends on which filters are present, not their values, so the
+    statements are cached and executed with bound parameters. Unlimited archives
+    insert and delete one primary key range (:cursor, :upper] at a time.
+    """
+    spec = _TABLE_SPECS.get(main_table)
+    if not spec:
+        raise Exception(f"Unknown table for column mapping: {main_table}")
+    
+    archive_table = spec.archive_name
+    time_field = spec.time_field
+    where_conditions = []
+    
+    # Date filters
+    if "date_start" in filter_keys and "date_end" in filter_keys:
+        where_conditions.append(f"{time_field} BETWEEN :date_start AND :date_end")
+    elif "date_end" in filter_keys:
+        # Check if this is an "older than" comparison (should use < instead of <=)
+        comparison_op = "<" if date_comparison == "older_than" else "<="
+        where_conditions.append(f"{time_field} {comparison_op} :date_end")
+    
+    # Entity filters
+    if "agent_name" in filter_keys:
+        where_conditions.append("AgentName = :agent_name")
+    
+    if "server_name" in filter_keys:
+        where_conditions.append("ServerName = :server_name")
+    
+    if "user_id" in filter_keys and main_table == "dsitransactionlog":
+        where_conditions.append("UserID = :filter_user_id")
+    
+    if "device_id" in filter_keys and main_table == "dsitransactionlog":
+        where_conditions.append("DeviceID = :device_id")
+    
+    where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    columns_list = _ARCHIVE_COLUMN_LISTS[main_table]
+    
+    # Limited operations take the oldest records first
+    # (the primary key breaks ties so the insert and delete pick the same rows)
+    primary_key = f"{main_table}.{spec.primary_key}"
+    order_clause = f"ORDER BY {time_field} ASC, {primary_key} ASC" if limited else ""
+    limit_clause = "LIMIT :limit" if limited else ""
+    # Everything else is moved in primary key ranges
+    chunk_clause = "" if limited else f"AND {primary_key} > :cursor AND {primary_key} <= :upper"
+    
+    # Count the candidates so skipped duplicates can be reported
+    count_query = text(f"""
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM {main_table}
+            WHERE {where_clause}
+            {order_clause}
+            {limit_clause}
+        ) AS candidates
+    """)
+    
+    # Archive in a single statement and let the database skip duplicates
+    unique_columns = ", ".join(spec.unique_key)
+    # Rows without the unique key value are never archived into a uniquely-keyed table
+    key_not_null = f"AND {main_table}.{spec.unique_key[0]} IS NOT NULL" if spec.unique_in_archive else ""
+    if spec.unique_in_archive and dialect in _CONFLICT_SKIPPING_DIALECTS:
+        # The archive's unique index skips conflicting rows in-line
+        insert_prefix = "INSERT IGNORE INTO" if dialect != "postgresql" else "INSERT INTO"
+        conflict_clause = f"ON CONFLICT ({unique_columns}) DO NOTHING" if dialect == "postgresql" else ""
+        archive_query = text(f"""
+            {insert_prefix} {archive_table} 
+            ({columns_list})
+            SELECT {columns_list}
+            FROM {main_table} 
+            WHERE ({where_clause}) 
+            {chunk_clause}
+            {key_not_null}
+            {order_clause}
+            {limit_clause}
+            {conflict_clause}
+        """)
+    else:
+        # No unique index to lean on (or no dialect support), so skip rows already archived by their key
+        duplicate_match = " AND ".join(f"arch.{column} = {main_table}.{column}" for column in spec.unique_key)
+        archive_query = text(f"""
+            INSERT INTO {archive_table} 
+            ({columns_list})
+            SELECT {columns_list}
+            FROM {main_table} 
+            WHERE ({where_clause})
+            {chunk_clause}
+            {key_not_null}
+            AND NOT EXISTS (
+                SELECT 1 FROM {archive_table} arch 
+                WHERE {duplicate_match}
+            )
+            {order_clause}
+            {limit_clause}
+        """)
+    
+    # Clean source - delete only the records that were actually archived
+    if limited:
+        # Join the source against the primary keys of the same limited selection
+        limited_records = f"""(
+                SELECT {primary_key} AS limited_pk
+                FROM {main_table}
+                WHERE {where_clause}
+                {order_clause}
+                {limit_clause}
+            ) AS limited_records"""
+        limited_match = f"{primary_key} = limited_records.limited_pk"
+        if dialect in ("mysql", "mariadb"):
+            delete_query = text(f"""
+                DELETE {main_table} FROM {main_table}
+                JOIN {limited_records}
+                ON {limited_match}
+            """)
+        elif dialect == "postgresql":
+            delete_query = text(f"""
+                DELETE FROM {main_table}
+                USING {limited_records}
+                WHERE {limited_match}
+            """)
+        else:
+            delete_query = text(f"""
+                DELETE FROM {main_table} 
+                WHERE {primary_key} IN (
+                    SELECT limited_pk FROM {limited_records}
+                )
+            """)
+        chunk_upper_bound = None
+    else:
+        delete_query = text(f"""
+            DELETE FROM {main_table} 
+            WHERE ({where_clause})
+            {chunk_clause}
+        """)
+        # Upper primary key of the next :chunk_size matching rows after :cursor
+        chunk_upper_bound = text(f"""
+            SELECT MAX({spec.primary_key}) FROM (
+                SELECT {spec.primary_key}
+                FROM {main_table}
+                WHERE ({where_clause})
+                AND {spec.primary_key} > :cursor
+                ORDER BY {spec.primary_key}
+                LIMIT :chunk_size
+            ) AS next_chunk
+        """)
+    
+    # On PostgreSQL the DELETE feeds the INSERT through a CTE, so each row is visited once
+    # and the archive and delete counts come back together
+    move_query = None
+    if dialect == "postgresql":
+        if limited:
+            moved_using = f"USING {limited_records}"
+            moved_where = limited_match
+        else:
+            moved_using = ""
+            moved_where = f"({where_clause}) {chunk_clause}"
+        if spec.unique_in_archive:
+            insert_filter = f"WHERE moved.{spec.unique_key[0]} IS NOT NULL"
+            conflict_clause = f"ON CONFLICT ({unique_columns}) DO NOTHING"
+        else:
+            moved_match = " AND ".join(f"arch.{column} = moved.{column}" for column in spec.unique_key)
+            insert_filter = f"WHERE NOT EXISTS (SELECT 1 FROM {archive_table} arch WHERE {moved_match})"
+            conflict_clause = ""
+        move_query = text(f"""
+            WITH moved AS (
+                DELETE FROM {main_table}
+                {moved_using}
+                WHERE {moved_where}
+                RETURNING {columns_list}
+            ), archived AS (
+                INSERT INTO {archive_table} ({columns_list})
+                SELECT {columns_list} FROM moved
+                {insert_filter}
+                {conflict_clause}
+                RETURNING 1
+            )
+            SELECT
+                (SELECT COUNT(*) FROM archived) AS archived_count,
+                (SELECT COUNT(*) FROM moved) AS deleted_count
+        """)
+    
+    return _ArchiveStatements(count_query, archive_query, delete_query, chunk_upper_bound, move_query)
+
 class ArchiveConfig:
-    """Configuration for archive duplicate handling"""
-    SKIP_DUPLICATES = True
-    DUPLICATE_CHECK_STRATEGY = {
-        "dsitransactionlog": ["GUID"],
-        "dsiactivities": ["ActivityID", "PostedTime"]
-    }
+    """Configuration for archive operations"""
+    # Rows moved per transaction when archiving without a record limit
+    CHUNK_SIZE = 10000
 
 class CRUDService:
     """Comprehensive CRUD operations with safety mechanisms and duplicate handling"""
@@ -29,14 +365,36 @@ class CRUDService:
         self.db = db_session
         self.auth_service = AuthService()
         self.job_logger = JobLoggerService(db_session)
+        # The session stays bound to one engine, so resolve its dialect once
+        self._dialect = db_session.get_bind().dialect.name
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking Session call in a worker thread so the event loop stays free"""
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    def _count_on_new_session(self, count_query, params: Dict[str, Any]) -> int:
+        """Run a COUNT query on a separate short-lived session bound to the same engine"""
+        with Session(bind=self.db.get_bind()) as session:
+            return session.execute(count_query, params).scalar() or 0
+    
+    def _count_candidates(self, count_query, params: Dict[str, Any]) -> Optional[int]:
+        """Count archive candidates on a separate session; None if the count fails.
+        
+        Never raises, so gathering it with a move cannot return while the move is
+        still using this session in its worker thread.
+        """
+        try:
+            return self._count_on_new_session(count_query, params)
+        except Exception as e:
+            logger.warning("Could not count archive candidates: %s", e)
+            return None
     
     def _get_archive_table_name(self, table_name: str) -> str:
         """Get the correct archive table name for a given main table name"""
-        if table_name == "dsiactivities":
-            return "dsiactivitiesarchive"
-        elif table_name == "dsitransactionlog":
-            return "dsitransactionlogarchive" 
-        elif table_name in ["dsiactivitiesarchive", "dsitransactionlogarchive"]:
+        spec = _TABLE_SPECS.get(table_name)
+        if spec:
+            return spec.archive_name
+        elif table_name in _ARCHIVE_TABLES:
             return table_name  # Already an archive table
         else:
             return f"{table_name}archive"  # Fallback for other tables
@@ -63,23 +421,21 @@ class CRUDService:
             
             # SAFETY CHECK: Enforce 7-day minimum archive age
             if "date_end" in operation.filters:
-                from datetime import datetime, timedelta
                 current_date = datetime.now()
                 min_archive_date = current_date - timedelta(days=7)
                 
                 # Parse the date_end filter
                 date_end_str = operation.filters["date_end"]
                 try:
-                    # Assuming YYYYMMDDHHMMSS format
-                    if len(date_end_str) >= 8:
-                        filter_date = datetime.strptime(date_end_str[:8], "%Y%m%d")
+                    filter_date = _parse_filter_date(date_end_str)
+                    if filter_date is not None:
                         if filter_date > min_archive_date:
                             return {
                                 "success": False, 
                                 "error": f"Safety rule violation: Can only archive records older than 7 days. Current cutoff date {filter_date.strftime('%Y-%m-%d')} is too recent. Minimum allowed date: {min_archive_date.strftime('%Y-%m-%d')}"
                             }
                 except ValueError:
-                    logger.warning(f"Could not parse date_end for validation: {date_end_str}")
+                    logger.warning("Could not parse date_end for validation: %s", date_end_str)
             
             # Preview first if not confirmed
             if not confirmed:
@@ -93,6 +449,7 @@ class CRUDService:
             main_model, archive_model = self._get_model_classes(operation.table)
             
             # Start transaction
+            archive_failed = False
             try:
                 self.db.begin()
                 
@@ -104,10 +461,15 @@ class CRUDService:
                     source="CHATBOT"
                 )
                 
-                # Execute archive with duplicate handling
-                archived_count, deleted_count, skipped_count = await self._perform_archive(
-                    operation, main_model, archive_model, user_id, reason
-                )
+                # Execute archive with duplicate handling; each batch runs inside a
+                # SAVEPOINT so a failure only undoes that batch and keeps the job log row
+                try:
+                    archived_count, deleted_count, skipped_count = await self._perform_archive(
+                        operation, main_model, archive_model, user_id, reason, job_log=job_log
+                    )
+                except Exception:
+                    archive_failed = True
+                    raise
                 
                 # Complete job log with enhanced information
                 self.job_logger.complete_job_log(
@@ -117,7 +479,8 @@ class CRUDService:
                     reason=f"Archive completed - Archived: {archived_count}, Deleted: {deleted_count}, Skipped duplicates: {skipped_count}"
                 )
                 
-                self.db.commit()
+                await self._run_blocking(self.db.commit)
+                _preview_counts.pop(_preview_count_key(operation, user_id), None)
                 
                 return {
                     "success": True,
@@ -132,24 +495,34 @@ class CRUDService:
                 }
                 
             except Exception as e:
-                self.db.rollback()
-                
                 # Log failed operation in job_logs
                 try:
-                    self.job_logger.log_failed_operation(
-                        job_type="ARCHIVE",
-                        table_name=operation.table,
-                        error_message=f"Archive operation failed for user {user_id}: {str(e)}",
-                        source="CHATBOT"
-                    )
-                    self.db.commit()
+                    error_message = f"Archive operation failed for user {user_id}: {str(e)}"
+                    if archive_failed:
+                        # Only the failed batch was rolled back; mark the started job log as failed
+                        self.job_logger.complete_job_log(
+                            job_log=job_log,
+                            status="FAILED",
+                            records_affected=job_log.records_affected or 0,
+                            reason=error_message
+                        )
+                        logger.error("Logged failed operation: ID=%s, Type=ARCHIVE, Table=%s, Error=%s", job_log.id, operation.table, error_message)
+                    else:
+                        self.db.rollback()
+                        self.job_logger.log_failed_operation(
+                            job_type="ARCHIVE",
+                            table_name=operation.table,
+                            error_message=error_message,
+                            source="CHATBOT"
+                        )
+                    await self._run_blocking(self.db.commit)
                 except Exception as log_error:
-                    logger.error(f"Failed to log error to job_logs: {log_error}")
+                    logger.error("Failed to log error to job_logs: %s", log_error)
                 
                 raise e
                 
         except Exception as e:
-            logger.error(f"ARCHIVE operation failed: {e}")
+            logger.error("ARCHIVE operation failed: %s", e)
             return {"success": False, "error": str(e)}
     
     async def execute_delete_operation(
@@ -184,16 +557,15 @@ class CRUDService:
                 # Parse the date_end filter
                 date_end_str = operation.filters["date_end"]
                 try:
-                    # Assuming YYYYMMDDHHMMSS format
-                    if len(date_end_str) >= 8:
-                        filter_date = datetime.strptime(date_end_str[:8], "%Y%m%d")
+                    filter_date = _parse_filter_date(date_end_str)
+                    if filter_date is not None:
                         if filter_date > min_delete_date:
                             return {
                                 "success": False, 
                                 "error": f"Safety rule violation: Can only delete archived records older than 30 days. Current cutoff date {filter_date.strftime('%Y-%m-%d')} is too recent. Minimum allowed date: {min_delete_date.strftime('%Y-%m-%d')}"
                             }
                 except ValueError:
-                    logger.warning(f"Could not parse date_end for delete validation: {date_end_str}")
+                    logger.warning("Could not parse date_end for delete validation: %s", date_end_str)
             
             # Preview first if not confirmed
             if not confirmed:
@@ -206,6 +578,7 @@ class CRUDService:
             # Execute delete operation
             _, archive_model = self._get_model_classes(operation.table)
             
+            delete_failed = False
             try:
                 self.db.begin()
                 
@@ -218,8 +591,15 @@ class CRUDService:
                     source="CHATBOT"
                 )
                 
-                # Execute delete
-                deleted_count = await self._perform_delete(operation, archive_model, user_id, reason)
+                # Execute delete inside a SAVEPOINT so a failure keeps the job log row
+                savepoint = await self._run_blocking(self.db.begin_nested)
+                try:
+                    deleted_count = await self._perform_delete(operation, archive_model, user_id, reason)
+                    await self._run_blocking(savepoint.commit)
+                except Exception:
+                    delete_failed = True
+                    await self._run_blocking(savepoint.rollback)
+                    raise
                 
                 # Complete job log
                 self.job_logger.complete_job_log(
@@ -229,7 +609,7 @@ class CRUDService:
                     reason=f"Successfully deleted {deleted_count} records from {archive_table_name}"
                 )
                 
-                self.db.commit()
+                await self._run_blocking(self.db.commit)
                 
                 return {
                     "success": True,
@@ -241,44 +621,43 @@ class CRUDService:
                 }
                 
             except Exception as e:
-                self.db.rollback()
-                
                 # Log failed operation in job_logs
                 try:
                     archive_table_name = self._get_archive_table_name(operation.table)
-                    self.job_logger.log_failed_operation(
-                        job_type="DELETE",
-                        table_name=archive_table_name,
-                        error_message=f"Delete operation failed for user {user_id}: {str(e)}",
-                        source="CHATBOT"
-                    )
-                    self.db.commit()
+                    error_message = f"Delete operation failed for user {user_id}: {str(e)}"
+                    if delete_failed:
+                        # Only the SAVEPOINT was rolled back; mark the started job log as failed
+                        self.job_logger.complete_job_log(job_log=job_log, status="FAILED", reason=error_message)
+                        logger.error("Logged failed operation: ID=%s, Type=DELETE, Table=%s, Error=%s", job_log.id, archive_table_name, error_message)
+                    else:
+                        self.db.rollback()
+                        self.job_logger.log_failed_operation(
+                            job_type="DELETE",
+                            table_name=archive_table_name,
+                            error_message=error_message,
+                            source="CHATBOT"
+                        )
+                    await self._run_blocking(self.db.commit)
                 except Exception as log_error:
-                    logger.error(f"Failed to log error to job_logs: {log_error}")
+                    logger.error("Failed to log error to job_logs: %s", log_error)
                 raise e
                 
         except Exception as e:
-            logger.error(f"DELETE operation failed: {e}")
+            logger.error("DELETE operation failed: %s", e)
             return {"success": False, "error": str(e)}
     
     async def _preview_archive_operation(self, operation: ParsedOperation, user_id: str) -> Dict[str, Any]:
         """Preview archive operation without executing"""
         main_model, _ = self._get_model_classes(operation.table)
-        
-
-        
-        query = self.db.query(main_model)
-        query = self._apply_filters(query, operation, main_model)
-        
-        record_count = query.count()
-        sample_records = query.limit(5).all()
+        record_count, sample_records = await self._fetch_preview(operation, main_model)
+        _store_preview_count(_preview_count_key(operation, user_id), record_count)
         
         return {
             "success": True,
             "operation": "ARCHIVE_PREVIEW",
             "table": operation.table,
             "preview_count": record_count,
-            "sample_records": [self._record_to_dict(record) for record in sample_records],
+            "sample_records": sample_records,
             "message": f"Preview: {record_count:,} records will be archived from {operation.table} to {self._get_archive_table_name(operation.table)}",
             "filters_applied": operation.filters,
             "safety_check": "Records will be copied to archive table before deletion from main table"
@@ -287,413 +666,173 @@ class CRUDService:
     async def _preview_delete_operation(self, operation: ParsedOperation, user_id: str) -> Dict[str, Any]:
         """Preview delete operation without executing"""
         _, archive_model = self._get_model_classes(operation.table)
-        
-        query = self.db.query(archive_model)
-        query = self._apply_filters(query, operation, archive_model)
-        
-        record_count = query.count()
-        sample_records = query.limit(5).all()
+        record_count, sample_records = await self._fetch_preview(operation, archive_model)
         
         return {
             "success": True,
             "operation": "DELETE_PREVIEW",
             "table": operation.table,
             "preview_count": record_count,
-            "sample_records": [self._record_to_dict(record) for record in sample_records],
+            "sample_records": sample_records,
             "message": f"WARNING: {record_count:,} records will be PERMANENTLY DELETED from {operation.table}",
             "filters_applied": operation.filters,
             "safety_warning": "This operation is IRREVERSIBLE. Records will be permanently removed."
         }
     
-    async def _check_existing_records(self, operation: ParsedOperation, archive_model) -> set:
-        """Check which records already exist in archive table to prevent duplicates"""
-        try:
-            if operation.table == "dsitransactionlog":
-                # Use GUID for uniqueness check in transaction logs
-                from sqlalchemy import select, and_
-                
-                # Build filter conditions to match what we're trying to archive
-                where_conditions = []
-                params = {}
-                
-                # Apply same filters as archive operation to get candidate GUIDs
-                if "date_start" in operation.filters and "date_end" in operation.filters:
-                    where_conditions.append("WhenReceived BETWEEN :date_start AND :date_end")
-                    params["date_start"] = operation.filters["date_start"]
-                    params["date_end"] = operation.filters["date_end"]
-                elif "date_end" in operation.filters:
-                    comparison_op = "<" if operation.filters.get("date_comparison") == "older_than" else "<="
-                    where_conditions.append(f"WhenReceived {comparison_op} :date_end")
-                    params["date_end"] = operation.filters["date_end"]
-                
-                if "user_id" in operation.filters:
-                    where_conditions.append("UserID = :filter_user_id")
-                    params["filter_user_id"] = operation.filters["user_id"]
-                
-                if "device_id" in operation.filters:
-                    where_conditions.append("DeviceID = :device_id")
-                    params["device_id"] = operation.filters["device_id"]
-                
-                where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-                
-                # Get GUIDs from main table that match our archive criteria
-                main_guids_query = text(f"SELECT GUID FROM dsitransactionlog WHERE {where_clause} AND GUID IS NOT NULL")
-                main_guids_result = self.db.execute(main_guids_query, params).fetchall()
-                candidate_guids = {row[0] for row in main_guids_result if row[0]}  # Filter out None values
-                
-                if not candidate_guids:
-                    return set()
-                
-                # Check which of these GUIDs already exist in archive - use batched approach for large sets
-                existing_guids = set()
-                batch_size = 1000  # Process in batches to avoid query size limits
-                
-                for i in range(0, len(candidate_guids), batch_size):
-                    batch = tuple(list(candidate_guids)[i:i+batch_size])
-                    existing_guids_query = text("""
-                        SELECT GUID FROM dsitransactionlogarchive 
-                        WHERE GUID IN :candidate_guids
-                    """)
-                    existing_result = self.db.execute(existing_guids_query, {"candidate_guids": batch}).fetchall()
-                    existing_guids.update({row[0] for row in existing_result if row[0]})
-                
-                logger.info(f"Duplicate check: Found {len(existing_guids)} existing GUIDs out of {len(candidate_guids)} candidates")
-                return existing_guids
-                
-            elif operation.table == "dsiactivities":
-                # Use ActivityID + PostedTime combination for uniqueness check in activities
-                from sqlalchemy import text
-                
-                # Build filter conditions
-                where_conditions = []
-                params = {}
-                
-                if "date_start" in operation.filters and "date_end" in operation.filters:
-                    where_conditions.append("PostedTime BETWEEN :date_start AND :date_end")
-                    params["date_start"] = operation.filters["date_start"]
-                    params["date_end"] = operation.filters["date_end"]
-                elif "date_end" in operation.filters:
-                    comparison_op = "<" if operation.filters.get("date_comparison") == "older_than" else "<="
-                    where_conditions.append(f"PostedTime {comparison_op} :date_end")
-                    params["date_end"] = operation.filters["date_end"]
-                
-                if "server_name" in operation.filters:
-                    where_conditions.append("ServerName = :server_name")
-                    params["server_name"] = operation.filters["server_name"]
-                
-                where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-                
-                # Get ActivityID + PostedTime combinations from main table
-                main_activities_query = text(f"""
-                    SELECT ActivityID, PostedTime FROM dsiactivities WHERE {where_clause}
-                """)
-                main_activities_result = self.db.execute(main_activities_query, params).fetchall()
-                candidate_activities = {(row[0], row[1]) for row in main_activities_result}
-                
-                if not candidate_activities:
-                    return set()
-                
-                # Check which combinations already exist in archive
-                # Build dynamic IN clause for tuples
-                activity_conditions = []
-                activity_params = {}
-                for i, (activity_id, posted_time) in enumerate(candidate_activities):
-                    activity_conditions.append(f"(ActivityID = :act_id_{i} AND PostedTime = :post_time_{i})")
-                    activity_params[f"act_id_{i}"] = activity_id
-                    activity_params[f"post_time_{i}"] = posted_time
-                
-                if activity_conditions:
-                    existing_activities_query = text(f"""
-                        SELECT ActivityID, PostedTime FROM dsiactivitiesarchive 
-                        WHERE {' OR '.join(activity_conditions)}
-                    """)
-                    existing_result = self.db.execute(existing_activities_query, activity_params).fetchall()
-                    return {(row[0], row[1]) for row in existing_result}
-                
-                return set()
-            
-            else:
-                # For other tables, return empty set (no duplicate checking implemented)
-                return set()
-                
-        except Exception as e:
-            logger.error(f"Error checking existing records for duplicate prevention: {e}")
-            # On error, return empty set to proceed with normal archiving
-            return set()
-
+    async def _fetch_preview(self, operation: ParsedOperation, model_class) -> Tuple[int, List[Dict]]:
+        """Fetch the matching record count and up to 5 sample records"""
+        table = model_class.__table__
+        preview_columns = _PREVIEW_COLUMNS.get(table.name)
+        columns = [table.c[name] for name in preview_columns] if preview_columns else list(table.columns)
+        query = self._apply_filters(select(*columns), operation, model_class)
+        
+        # Plain COUNT(*) over the filtered query (which already carries any record limit);
+        # COUNT(*) OVER () would need window functions, which MySQL 5.7 lacks
+        count_query = select(func.count()).select_from(query.subquery())
+        record_count = (await self._run_blocking(self.db.execute, count_query)).scalar() or 0
+        
+        # Never sample more rows than a smaller record limit allows
+        sample_limit = 5
+        limit_value = operation.filters.get("limit")
+        if isinstance(limit_value, int) and limit_value > 0:
+            sample_limit = min(sample_limit, limit_value)
+        result = await self._run_blocking(self.db.execute, query.limit(sample_limit))
+        rows = result.mappings().all()
+        
+        sample_records = []
+        for row in rows:
+            record = {}
+            for name, value in row.items():
+                # Convert datetime to string for JSON serialization
+                if isinstance(value, datetime):
+                    value = value.isoformat()
+                record[name] = value
+            sample_records.append(record)
+        
+        return record_count, sample_records
+    
     async def _perform_archive(
         self, 
         operation: ParsedOperation, 
         main_model, 
         archive_model, 
         user_id: str, 
-        reason: str
+        reason: str,
+        job_log=None
     ) -> Tuple[int, int, int]:
         """Perform the actual archive operation with duplicate handling"""
+        logger.info("Starting archive operation for table %s", operation.table)
+        filters = operation.filters
         
-        # Step 1: Check for existing records to prevent duplicates
-        logger.info(f"Starting archive operation for table {operation.table}")
-        logger.info(f"Checking for existing records in archive to prevent duplicates...")
-        existing_records = await self._check_existing_records(operation, archive_model)
-        skipped_count = len(existing_records)
-        
-        if skipped_count > 0:
-            logger.info(f"Found {skipped_count} records that already exist in archive - will skip duplicates")
-            if operation.table == "dsitransactionlog" and skipped_count <= 10:
-                # Log first few GUIDs for debugging
-                sample_guids = list(existing_records)[:5]
-                logger.info(f"Sample existing GUIDs: {sample_guids}")
-        
-        # Build filter conditions for SQL
-        where_conditions = []
-        params = {"user_id": user_id, "reason": reason}
-        
-        # Date filters
-        if "date_start" in operation.filters and "date_end" in operation.filters:
-            time_field = "PostedTime" if operation.table == "dsiactivities" else "WhenReceived"
-            where_conditions.append(f"{time_field} BETWEEN :date_start AND :date_end")
-            params["date_start"] = operation.filters["date_start"]
-            params["date_end"] = operation.filters["date_end"]
-        elif "date_end" in operation.filters:
-            time_field = "PostedTime" if operation.table == "dsiactivities" else "WhenReceived"
-            # Check if this is an "older than" comparison (should use < instead of <=)
-            if operation.filters.get("date_comparison") == "older_than":
-                where_conditions.append(f"{time_field} < :date_end")
-            else:
-                where_conditions.append(f"{time_field} <= :date_end")
-            params["date_end"] = operation.filters["date_end"]
-        
-        # Entity filters
-        if "agent_name" in operation.filters:
-            where_conditions.append("AgentName = :agent_name")
-            params["agent_name"] = operation.filters["agent_name"]
-        
-        if "server_name" in operation.filters:
-            where_conditions.append("ServerName = :server_name")
-            params["server_name"] = operation.filters["server_name"]
-        
-        if "user_id" in operation.filters and operation.table == "dsitransactionlog":
-            where_conditions.append("UserID = :filter_user_id")
-            params["filter_user_id"] = operation.filters["user_id"]
-        
-        if "device_id" in operation.filters and operation.table == "dsitransactionlog":
-            where_conditions.append("DeviceID = :device_id")
-            params["device_id"] = operation.filters["device_id"]
-        
-        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-        
-                # Step 2: Add exclusion conditions to skip duplicates
-        exclusion_conditions = []
-        if existing_records:
-            if operation.table == "dsitransactionlog":
-                # Exclude records with GUIDs that already exist in archive
-                if len(existing_records) > 0:
-                    # Handle large sets by using batched exclusions
-                    if len(existing_records) <= 1000:
-                        exclusion_conditions.append("GUID NOT IN :existing_guids")
-                        params["existing_guids"] = tuple(existing_records)
-                    else:
-                        # For very large sets, use NOT EXISTS instead
-                        exclusion_conditions.append("""
-                            NOT EXISTS (
-                                SELECT 1 FROM dsitransactionlogarchive arch 
-                                WHERE arch.GUID = dsitransactionlog.GUID
-                            )
-                        """)
-            elif operation.table == "dsiactivities":
-                # Exclude records with ActivityID + PostedTime combinations that already exist
-                activity_exclusions = []
-                for i, (activity_id, posted_time) in enumerate(existing_records):
-                    activity_exclusions.append(f"NOT (ActivityID = :excl_act_id_{i} AND PostedTime = :excl_post_time_{i})")
-                    params[f"excl_act_id_{i}"] = activity_id
-                    params[f"excl_post_time_{i}"] = posted_time
-                
-                if activity_exclusions:
-                    exclusion_conditions.append(f"({' AND '.join(activity_exclusions)})")        # Combine original filters with exclusion conditions
-        final_where_clause = where_clause
-        if exclusion_conditions:
-            final_where_clause = f"({where_clause}) AND ({' AND '.join(exclusion_conditions)})"
-        
-        # Archive query - copy to archive table with explicit column mapping
-        archive_table = self._get_archive_table_name(operation.table)
-        main_table = operation.table
-        
-        # Get column names from main table (excluding the archive-specific columns)
-        main_columns = []
-        if operation.table == "dsiactivities":
-            main_columns = [
-                "ActivityID", "ActivityType", "TrackingID", "SecondaryTrackingID", 
-                "AgentName", "ThreadID", "Description", "PostedTime", "PostedTimeUTC",
-                "LineNumber", "FileName", "MethodName", "ServerName", "InstanceID",
-                "IdenticalAlertCount", "AlertLevel", "DismissedBy", "DismissedDateTime",
-                "LastIdenticalAlertDateTime", "EventID", "DefaultDescription", "ExceptionMessage"
-            ]
-        elif operation.table == "dsitransactionlog":
-            main_columns = [
-                "RecordStatus", "ProcessMethod", "TransactionType", "ServerName", "DeviceID", 
-                "UserID", "DeviceLocalTime", "DeviceUTCTime", "DeviceSequenceID", "WhenReceived",
-                "WhenProcessed", "WhenExtracted", "ElapsedTime", "AppID", "AppVersion", "AppItemID",
-                "WorldHostID", "ConnectorID", "FunctionDefVersion", "FunctionCallID", "FunctionCallRC",
-                "DataIn", "DataOut", "ErrorsOut", "SecurityID", "GUID", "UnitID", "PromotionLevelID",
-                "EnvironmentID", "Marking", "OrgUnitID", "TrackingReference"
-            ]
-        
-        if not main_columns:
-            raise Exception(f"Unknown table for column mapping: {operation.table}")
-        
-        columns_list = ", ".join(main_columns)
-        values_list = ", ".join(main_columns)
-        
-        # Step 3: Handle LIMIT for specific record counts
-        limit_clause = ""
-        order_clause = ""
-        if "limit" in operation.filters:
-            limit_value = operation.filters["limit"]
-            if isinstance(limit_value, int) and limit_value > 0:
-                # Add ORDER BY to get oldest records first, then LIMIT
-                time_field = "PostedTime" if operation.table == "dsiactivities" else "WhenReceived"
-                order_clause = f"ORDER BY {time_field} ASC"
-                limit_clause = f"LIMIT {limit_value}"
-                logger.info(f"Applying LIMIT {limit_value} to archive operation with {order_clause}")
-        
-        # Step 4: Archive only non-duplicate records with additional safety check
+        # Bind filter values; the statement shape only depends on which keys are present
+        filter_keys = frozenset(key for key in _ARCHIVE_FILTER_KEYS if key in filters)
+        params = {}
+        if "date_end" in filter_keys:
+            params["date_end"] = filters["date_end"]
+            if "date_start" in filter_keys:
+                params["date_start"] = filters["date_start"]
+        if "agent_name" in filter_keys:
+            params["agent_name"] = filters["agent_name"]
+        if "server_name" in filter_keys:
+            params["server_name"] = filters["server_name"]
         if operation.table == "dsitransactionlog":
-            # For transaction logs, add explicit EXISTS check to prevent GUID conflicts
-            archive_query = text(f"""
-                INSERT INTO {archive_table} 
-                ({columns_list})
-                SELECT {values_list}
-                FROM {main_table} 
-                WHERE ({final_where_clause}) 
-                AND NOT EXISTS (
-                    SELECT 1 FROM {archive_table} arch 
-                    WHERE arch.GUID = {main_table}.GUID
+            if "user_id" in filter_keys:
+                params["filter_user_id"] = filters["user_id"]
+            if "device_id" in filter_keys:
+                params["device_id"] = filters["device_id"]
+        
+        # Handle LIMIT for specific record counts
+        limit_value = filters.get("limit")
+        limited = isinstance(limit_value, int) and limit_value > 0
+        if limited:
+            params["limit"] = limit_value
+            logger.info("Applying LIMIT %d to archive operation, oldest records first", limit_value)
+        
+        statements = _build_archive_statements(
+            operation.table,
+            filter_keys,
+            filters.get("date_comparison"),
+            limited,
+            self._dialect
+        )
+        
+        # Reuse the count from a recent preview of this archive when there is one
+        candidate_count = _get_preview_count(_preview_count_key(operation, user_id))
+        
+        if limited:
+            # The record limit bounds the operation, so move it with one INSERT/DELETE pair
+            if candidate_count is None:
+                # The count only reads the main table, so run it on its own connection
+                # while the rows are moved in this session's transaction
+                candidate_count, (archived_count, deleted_count) = await asyncio.gather(
+                    self._run_blocking(self._count_candidates, statements.count, params),
+                    self._move_archive_rows(statements, params)
                 )
-                AND {main_table}.GUID IS NOT NULL
-                {order_clause}
-                {limit_clause}
-            """)
+            else:
+                archived_count, deleted_count = await self._move_archive_rows(statements, params)
         else:
-            # For activities, use the standard approach
-            archive_query = text(f"""
-                INSERT INTO {archive_table} 
-                ({columns_list})
-                SELECT {values_list}
-                FROM {main_table} 
-                WHERE {final_where_clause}
-                {order_clause}
-                {limit_clause}
-            """)
-        
-        # Execute archive with duplicate exclusions and error handling
-        archive_params = {k: v for k, v in params.items() if k not in ["user_id", "reason"]}
-        try:
-            result = self.db.execute(archive_query, archive_params)
-            archived_count = result.rowcount
-        except Exception as e:
-            # If we still get a duplicate key error, it means our detection missed some records
-            if "Duplicate entry" in str(e) and "GUID" in str(e):
-                logger.warning(f"GUID duplicate detected during archive, implementing fallback strategy: {e}")
-                
-                # Fallback: Use a more conservative approach with row-by-row checking
-                if operation.table == "dsitransactionlog":
-                    # Get records to archive one by one and check each GUID
-                    select_query = text(f"""
-                        SELECT GUID FROM {main_table} 
-                        WHERE {where_clause} AND GUID IS NOT NULL
-                    """)
-                    select_params = {k: v for k, v in params.items() if k not in ["user_id", "reason", "existing_guids"] and not k.startswith("excl_")}
-                    
-                    candidate_records = self.db.execute(select_query, select_params).fetchall()
-                    safe_guids = []
-                    
-                    # Check each GUID individually
-                    for record in candidate_records:
-                        guid = record[0]
-                        check_exists = text("SELECT COUNT(*) FROM dsitransactionlogarchive WHERE GUID = :guid")
-                        exists_count = self.db.execute(check_exists, {"guid": guid}).scalar()
-                        
-                        if exists_count == 0:
-                            safe_guids.append(guid)
-                        else:
-                            skipped_count += 1
-                    
-                    # Archive only the safe records
-                    if safe_guids:
-                        safe_archive_query = text(f"""
-                            INSERT INTO {archive_table} 
-                            ({columns_list})
-                            SELECT {values_list}
-                            FROM {main_table} 
-                            WHERE {where_clause} AND GUID IN :safe_guids
-                        """)
-                        
-                        safe_params = select_params.copy()
-                        safe_params["safe_guids"] = tuple(safe_guids)
-                        result = self.db.execute(safe_archive_query, safe_params)
-                        archived_count = result.rowcount
-                    else:
-                        archived_count = 0
-                        logger.warning("No safe records to archive after duplicate checking")
+            # Walk the matching rows in primary key order, committing one chunk at a time
+            # so locks and undo/redo stay bounded however large the archive is
+            archived_count = deleted_count = 0
+            cursor = 0
+            count_pending = candidate_count is None
+            while True:
+                bound_params = {**params, "cursor": cursor, "chunk_size": ArchiveConfig.CHUNK_SIZE}
+                if count_pending:
+                    # Both are reads, so count on a separate connection alongside the first lookup
+                    candidate_count, bound_result = await asyncio.gather(
+                        self._run_blocking(self._count_candidates, statements.count, params),
+                        self._run_blocking(self.db.execute, statements.chunk_upper_bound, bound_params)
+                    )
+                    count_pending = False
                 else:
-                    raise  # Re-raise for non-transaction tables
-            else:
-                raise  # Re-raise for other types of errors
-        
-        # Step 5: Clean source - delete only the records that were actually archived
-        # Apply the same limit and ordering to ensure we delete exactly what was archived
-        if limit_clause and order_clause:
-            # For limited operations, we need to identify the exact records that were archived
-            # Use a subquery to select the same records that were archived
-            time_field = "PostedTime" if operation.table == "dsiactivities" else "WhenReceived"
-            primary_key = "ActivityID" if operation.table == "dsiactivities" else "GUID"
-            
-            delete_query = text(f"""
-                DELETE FROM {main_table} 
-                WHERE {primary_key} IN (
-                    SELECT {primary_key} FROM (
-                        SELECT {primary_key}
-                        FROM {main_table} 
-                        WHERE {where_clause}
-                        {order_clause}
-                        {limit_clause}
-                    ) AS limited_records
+                    bound_result = await self._run_blocking(self.db.execute, statements.chunk_upper_bound, bound_params)
+                upper = bound_result.scalar()
+                if upper is None:
+                    break
+                
+                chunk_archived, chunk_deleted = await self._move_archive_rows(
+                    statements, {**params, "cursor": cursor, "upper": upper}
                 )
-            """)
-        else:
-            # For unlimited operations, use the original approach
-            delete_query = text(f"""
-                DELETE FROM {main_table} 
-                WHERE {where_clause}
-            """)
-        
-        # Use original params without exclusion conditions for delete
-        delete_params = {}
-        for key, value in params.items():
-            if key not in ["user_id", "reason"] and not key.startswith("existing_") and not key.startswith("excl_"):
-                delete_params[key] = value
-        
-        delete_result = self.db.execute(delete_query, delete_params)
-        deleted_count = delete_result.rowcount
+                archived_count += chunk_archived
+                deleted_count += chunk_deleted
+                
+                if job_log is not None:
+                    self.job_logger.update_job_log_progress(job_log, archived_count)
+                await self._run_blocking(self.db.commit)
+                cursor = upper
         
-        # Step 5: Final validation - verify no conflicts occurred
-        if operation.table == "dsitransactionlog" and archived_count > 0:
-            # Quick check to ensure we didn't create any duplicates
-            conflict_check = text("""
-                SELECT COUNT(*) FROM dsitransactionlog m
-                INNER JOIN dsitransactionlogarchive a ON m.GUID = a.GUID
-                WHERE m.GUID IS NOT NULL
-            """)
-            conflict_count = self.db.execute(conflict_check).scalar()
-            
-            if conflict_count > 0:
-                logger.warning(f"Detected {conflict_count} GUID conflicts after archive operation")
-                # Don't fail the operation, but log for investigation
+        if candidate_count is not None:
+            skipped_count = max(candidate_count - archived_count, 0)
+        else:
+            # Without the count, source rows deleted but not inserted are the skipped duplicates
+            skipped_count = max(deleted_count - archived_count, 0)
         
-        logger.info(f"Archive completed - Archived: {archived_count}, Deleted from source: {deleted_count}, Skipped duplicates: {skipped_count}")
+        if skipped_count > 0:
+            logger.info("Skipped %d records that already exist in archive", skipped_count)
+
+        logger.info("Archive completed - Archived: %d, Deleted from source: %d, Skipped duplicates: %d", archived_count, deleted_count, skipped_count)
         
         return archived_count, deleted_count, skipped_count
     
+    async def _move_archive_rows(self, statements: _ArchiveStatements, params: Dict[str, Any]) -> Tuple[int, int]:
+        """Copy rows to the archive and delete them from the source inside a SAVEPOINT"""
+        savepoint = await self._run_blocking(self.db.begin_nested)
+        try:
+            if statements.move is not None:
+                moved = (await self._run_blocking(self.db.execute, statements.move, params)).one()
+                archived_count, deleted_count = moved.archived_count, moved.deleted_count
+            else:
+                archive_result = await self._run_blocking(self.db.execute, statements.insert, params)
+                delete_result = await self._run_blocking(self.db.execute, statements.delete, params)
+                archived_count, deleted_count = archive_result.rowcount, delete_result.rowcount
+            await self._run_blocking(savepoint.commit)
+        except Exception:
+            # Only undo this batch; earlier chunks and the job log row are kept
+            await self._run_blocking(savepoint.rollback)
+            raise
+        return archived_count, deleted_count
+    
     async def _perform_delete(
         self, 
         operation: ParsedOperation, 
@@ -707,22 +846,16 @@ class CRUDService:
         query = self._apply_filters(query, operation, archive_model)
         
         # Execute delete
-        deleted_count = query.delete(synchronize_session=False)
+        deleted_count = await self._run_blocking(query.delete, synchronize_session=False)
         
         return deleted_count
     
     def _get_model_classes(self, table_name: str):
         """Get SQLAlchemy model classes for main and archive tables"""
-        if table_name == "dsiactivities":
-            return DSIActivities, ArchiveDSIActivities
-        elif table_name == "dsitransactionlog":
-            return DSITransactionLog, ArchiveDSITransactionLog
-        elif table_name == "dsiactivitiesarchive":
-            return ArchiveDSIActivities, ArchiveDSIActivities  # Archive table as both main and archive
-        elif table_name == "dsitransactionlogarchive":
-            return ArchiveDSITransactionLog, ArchiveDSITransactionLog  # Archive table as both main and archive
-        else:
+        model_classes = _MODEL_CLASSES.get(table_name)
+        if model_classes is None:
             raise ValueError(f"Unsupported table: {table_name}")
+        return model_classes
     
     def _apply_filters(self, query, operation: ParsedOperation, model_class):
         """Apply filters to SQLAlchemy query"""
@@ -744,18 +877,10 @@ class CRUDService:
                 query = query.filter(getattr(model_class, time_field) <= filters["date_end"])
         
         # Entity filters
-        if "agent_name" in filters:
-            query = query.filter(model_class.AgentName == filters["agent_name"])
-        
-        if "server_name" in filters:
-            query = query.filter(model_class.ServerName == filters["server_name"])
-        
-        if "user_id" in filters and hasattr(model_class, "UserID"):
-            query = query.filter(model_class.UserID == filters["user_id"])
-        
-        if "device_id" in filters and hasattr(model_class, "DeviceID"):
-            query = query.filter(model_class.DeviceID == filters["device_id"])
-        
+        for key, handler in _FILTER_HANDLERS.items():
+            if key in filters:
+                query = handler(query, model_class, filters[key])
+
         # Apply limit for specific record counts (e.g., "archive oldest 300 records")
         if "limit" in filters:
             limit_value = filters["limit"]
@@ -763,17 +888,6 @@ class CRUDService:
                 # For archive operations, order by date to get oldest records first
                 time_field = "PostedTime" if ("activities" in operation.table) else "WhenReceived"
                 query = query.order_by(getattr(model_class, time_field).asc()).limit(limit_value)
-                logger.info(f"Applied record limit of {limit_value} to archive operation, ordering by {time_field}")
+                logger.info("Applied record limit of %d to archive operation, ordering by %s", limit_value, time_field)
         
         return query
-    
-    def _record_to_dict(self, record) -> Dict:
-        """Convert SQLAlchemy record to dictionary"""
-        result = {}
-        for column in record.__table__.columns:
-            value = getattr(record, column.name)
-            # Convert datetime to string for JSON serialization
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            result[column.name] = value
-        return result
\ No newline at end of file
@@ -3,11 +3,12 @@ Direct Database Service - Alternative to MCP
 This service provides direct database operations without MCP protocol overhead.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import bindparam, case, func, literal, select, text, union_all
 
 from models.activities import ArchiveDSIActivities, DSIActivities
 from models.transactions import ArchiveDSITransactionLog, DSITransactionLog
@@ -17,10 +18,12 @@ logger = logging.getLogger(__name__)
 
 def setup_database_logging(name: str = __name__) -> logging.Logger:
     """Setup consistent logging for database operations"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(levelname)s:%(name)s:%(message)s'
-    )
+    # Leave logging alone once the application (or an earlier call) has configured it
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(levelname)s:%(name)s:%(message)s'
+        )
     return logging.getLogger(name)
 
 # Common table definitions
@@ -31,6 +34,89 @@ REQUIRED_TABLES = [
     'dsitransactionlogarchive'
 ]
 
+# Set form of the supported table names for O(1) validation
+_VALID_TABLE_NAMES = frozenset(REQUIRED_TABLES)
+
+# Tables reported by get_detailed_table_stats; main tables show records older than
+# 7 days (archivable), archive tables older than 30 days (deletable)
+DETAILED_STATS_TABLES = [
+    {
+        'name': 'dsiactivities',
+        'display_name': 'DSI Activities',
+        'model': DSIActivities,
+        'time_column': 'PostedTime',
+        'type': 'main',
+        'older_than_days': 7
+    },
+    {
+        'name': 'dsitransactionlog', 
+        'display_name': 'DSI Transaction Log',
+        'model': DSITransactionLog,
+        'time_column': 'WhenReceived',
+        'type': 'main',
+        'older_than_days': 7
+    },
+    {
+        'name': 'dsiactivitiesarchive',
+        'display_name': 'DSI Activities Archive',
+        'model': ArchiveDSIActivities,
+        'time_column': 'PostedTime',
+        'type': 'archive',
+        'older_than_days': 30
+    },
+    {
+        'name': 'dsitransactionlogarchive',
+        'display_name': 'DSI Transaction Log Archive', 
+        'model': ArchiveDSITransactionLog,
+        'time_column': 'WhenReceived',
+        'type': 'archive',
+        'older_than_days': 30
+    }
+]
+
+def _aged_condition(table_info: Dict[str, Any]):
+    """time_column < :cutoff_<days>, built from the model so the column is quoted per dialect"""
+    time_col = getattr(table_info['model'], table_info['time_column'])
+    return time_col < bindparam(f"cutoff_{table_info['older_than_days']}")
+
+# Every table's total and aged counts in one round-trip; built from the model columns
+# so CamelCase identifiers are quoted for each dialect, with the cutoffs bound as
+# :cutoff_7 / :cutoff_30
+DETAILED_STATS_QUERY = union_all(*(
+    select(
+        literal(table_info['name']).label('table_name'),
+        func.count().label('total_count'),
+        func.sum(case((_aged_condition(table_info), 1), else_=0)).label('older_count')
+    ).select_from(table_info['model'])
+    for table_info in DETAILED_STATS_TABLES
+))
+
+# Aged counts only, for when totals come from the catalog estimate; the WHERE lets
+# each branch use the time column index instead of scanning the whole table
+DETAILED_AGED_COUNT_QUERY = union_all(*(
+    select(
+        literal(table_info['name']).label('table_name'),
+        func.count().label('older_count')
+    ).select_from(table_info['model']).where(_aged_condition(table_info))
+    for table_info in DETAILED_STATS_TABLES
+))
+
+# Catalog row-count estimates per dialect (refreshed by ANALYZE / InnoDB statistics)
+_STATS_TABLE_NAMES = ", ".join(f"'{table_info['name']}'" for table_info in DETAILED_STATS_TABLES)
+ESTIMATED_ROW_COUNT_QUERIES = {
+    "postgresql": text(
+        f"SELECT relname AS table_name, reltuples::bigint AS row_estimate "
+        f"FROM pg_class WHERE relkind = 'r' AND relname IN ({_STATS_TABLE_NAMES}) "
+        f"AND relnamespace = current_schema()::regnamespace"
+    ),
+    "mysql": text(
+        f"SELECT table_name AS table_name, table_rows AS row_estimate "
+        f"FROM information_schema.tables "
+        f"WHERE table_schema = DATABASE() AND table_name IN ({_STATS_TABLE_NAMES})"
+    )
+}
+ESTIMATED_ROW_COUNT_QUERIES["mariadb"] = ESTIMATED_ROW_COUNT_QUERIES["mysql"]
+
 class DatabaseService:
     """Direct database operations service - replaces MCP tools"""
     
@@ -46,7 +132,7 @@ class DatabaseService:
     
     def validate_table_name(self, table_name: str) -> bool:
         """Validate if table name is supported"""
-        return table_name in self.VALID_TABLE_NAMES
+        return table_name in _VALID_TABLE_NAMES
     
     async def get_table_stats(self, table_name: Optional[str] = None) -> Dict[str, Any]:
         """Get table statistics and counts - replaces MCP get_table_stats tool"""
@@ -124,137 +210,129 @@ class DatabaseService:
                 "stats": {}
             }
 
-    async def get_detailed_table_stats(self) -> Dict[str, Any]:
-        """Get detailed table statistics with age-based counts for all 4 tables"""
+    def _get_table_age_stats(self, table_info: Dict[str, Any], cutoff: str) -> Dict[str, Any]:
+        """Count all rows and rows older than the cutoff for one table on its own session"""
+        stats = {
+            'display_name': table_info['display_name'],
+            'type': table_info['type'],
+            'total_count': 0,
+            'older_than_days': table_info['older_than_days'],
+            'older_count': 0
+        }
         try:
-            from sqlalchemy import text
-            from datetime import datetime, timedelta
+            model = table_info['model']
+            time_col = getattr(model, table_info['time_column'])
+            
+            # Total count (all rows, including those with NULL IDs) and the count older
+            # than the cutoff in one pass (string date columns - string comparison)
+            with Session(bind=self.db.get_bind()) as session:
+                total_count, older_count = session.query(
+                    func.count(),
+                    func.count(case((time_col < cutoff, 1)))
+                ).select_from(model).one()
+            
+            stats['total_count'] = total_count
+            stats['older_count'] = older_count or 0
             
+        except Exception as e:
+            logger.error(f"Error getting stats for {table_info['type']} table {table_info['name']}: {e}")
+            stats['error'] = str(e)
+        
+        return stats
+
+    def _get_all_table_age_stats(self, cutoffs: Dict[int, str]) -> Dict[str, Dict[str, Any]]:
+        """Count all rows and aged rows for every stats table in a single UNION ALL query"""
+        params = {f"cutoff_{days}": cutoff for days, cutoff in cutoffs.items()}
+        with Session(bind=self.db.get_bind()) as session:
+            rows = session.execute(DETAILED_STATS_QUERY, params).all()
+        
+        counts = {row.table_name: row for row in rows}
+        detailed_stats = {}
+        for table_info in DETAILED_STATS_TABLES:
+            row = counts[table_info['name']]
+            detailed_stats[table_info['name']] = {
+                'display_name': table_info['display_name'],
+                'type': table_info['type'],
+                'total_count': row.total_count,
+                'older_than_days': table_info['older_than_days'],
+                'older_count': int(row.older_count or 0)
+            }
+        return detailed_stats
+
+    def _get_estimated_table_age_stats(self, cutoffs: Dict[int, str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Use catalog row estimates as totals and count only the aged rows.
+
+        Returns None when the dialect has no estimate or a table has not been analyzed yet.
+        """
+        estimate_query = ESTIMATED_ROW_COUNT_QUERIES.get(self.db.get_bind().dialect.name)
+        if estimate_query is None:
+            return None
+
+        params = {f"cutoff_{days}": cutoff for days, cutoff in cutoffs.items()}
+        with Session(bind=self.db.get_bind()) as session:
+            estimates = {row.table_name: row.row_estimate for row in session.execute(estimate_query)}
+            if any(estimates.get(table_info['name']) is None or estimates[table_info['name']] < 0
+                   for table_info in DETAILED_STATS_TABLES):
+                return None
+            aged_counts = {row.table_name: row.older_count for row in session.execute(DETAILED_AGED_COUNT_QUERY, params)}
+
+        detailed_stats = {}
+        for table_info in DETAILED_STATS_TABLES:
+            older_count = int(aged_counts.get(table_info['name']) or 0)
+            detailed_stats[table_info['name']] = {
+                'display_name': table_info['display_name'],
+                'type': table_info['type'],
+                # Estimates lag behind recent writes; never report fewer rows than were counted
+                'total_count': max(int(estimates[table_info['name']]), older_count),
+                'total_is_estimate': True,
+                'older_than_days': table_info['older_than_days'],
+                'older_count': older_count
+            }
+        return detailed_stats
+
+    async def get_detailed_table_stats(self, estimate: bool = False) -> Dict[str, Any]:
+        """Get detailed table statistics with age-based counts for all 4 tables
+
+        Every table is counted exactly unless estimate=True, in which case totals
+        come from the database's row estimates where they are available.
+        Estimated totals are flagged with total_is_estimate per table and
+        totals_are_estimates overall; older_count is always exact.
+        """
+        try:
             # Calculate cutoff dates
             seven_days_ago = (datetime.now() - timedelta(days=7)).strftime("%Y%m%d%H%M%S")
             thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%Y%m%d%H%M%S")
-            
-            detailed_stats = {}
-            
-            # Main tables statistics
-            main_tables = [
-                {
-                    'name': 'dsiactivities',
-                    'display_name': 'DSI Activities',
-                    'model': DSIActivities,
-                    'time_column': 'PostedTime'
-                },
-                {
-                    'name': 'dsitransactionlog', 
-                    'display_name': 'DSI Transaction Log',
-                    'model': DSITransactionLog,
-                    'time_column': 'WhenReceived'
-                }
-            ]
-            
-            # Archive tables statistics
-            archive_tables = [
-                {
-                    'name': 'dsiactivitiesarchive',
-                    'display_name': 'DSI Activities Archive',
-                    'model': ArchiveDSIActivities,
-                    'time_column': 'PostedTime'
-                },
-                {
-                    'name': 'dsitransactionlogarchive',
-                    'display_name': 'DSI Transaction Log Archive', 
-                    'model': ArchiveDSITransactionLog,
-                    'time_column': 'WhenReceived'
-                }
-            ]
-            
-            # Process main tables
-            for table_info in main_tables:
-                try:
-                    table_name = table_info['name']
-                    model = table_info['model']
-                    time_column = table_info['time_column']
-                    
-                    # Total count - use .count() to count all rows including those with NULL IDs
-                    total_count = self.db.query(model).count()
-                    
-                    # Count older than 7 days
-                    older_than_7_days = 0
-                    if total_count > 0:
-                        try:
-                            time_col = getattr(model, time_column)
-                            # String date columns - use string comparison
-                            older_than_7_days = self.db.query(func.count(time_col)).filter(
-                                time_col < seven_days_ago
-                            ).scalar() or 0
-                        except Exception as e:
-                            logger.warning(f"Could not calculate age-based count for {table_name}: {e}")
-                            older_than_7_days = 0
-                    
-                    detailed_stats[table_name] = {
-                        'display_name': table_info['display_name'],
-                        'type': 'main',
-                        'total_count': total_count,
-                        'older_than_days': 7,
-                        'older_count': older_than_7_days
-                    }
-                    
-                except Exception as e:
-                    logger.error(f"Error getting stats for main table {table_info['name']}: {e}")
-                    detailed_stats[table_info['name']] = {
-                        'display_name': table_info['display_name'],
-                        'type': 'main',
-                        'total_count': 0,
-                        'older_than_days': 7,
-                        'older_count': 0,
-                        'error': str(e)
-                    }
-            
-            # Process archive tables
-            for table_info in archive_tables:
+            cutoffs = {7: seven_days_ago, 30: thirty_days_ago}
+
+            detailed_stats = None
+            if estimate:
                 try:
-                    table_name = table_info['name']
-                    model = table_info['model']
-                    time_column = table_info['time_column']
-                    
-                    # Total count - use .count() to count all rows including those with NULL IDs
-                    total_count = self.db.query(model).count()
-                    
-                    # Count older than 30 days
-                    older_than_30_days = 0
-                    if total_count > 0:
-                        try:
-                            time_col = getattr(model, time_column)
-                            # Archive tables use string date format
-                            older_than_30_days = self.db.query(func.count(time_col)).filter(
-                                time_col < thirty_days_ago
-                            ).scalar() or 0
-                        except Exception as e:
-                            logger.warning(f"Could not calculate age-based count for {table_name}: {e}")
-                            older_than_30_days = 0
-                    
-                    detailed_stats[table_name] = {
-                        'display_name': table_info['display_name'],
-                        'type': 'archive',
-                        'total_count': total_count,
-                        'older_than_days': 30,
-                        'older_count': older_than_30_days
-                    }
-                    
+                    detailed_stats = await asyncio.to_thread(self._get_estimated_table_age_stats, cutoffs)
                 except Exception as e:
-                    logger.error(f"Error getting stats for archive table {table_info['name']}: {e}")
-                    detailed_stats[table_info['name']] = {
-                        'display_name': table_info['display_name'],
-                        'type': 'archive',
-                        'total_count': 0,
-                        'older_than_days': 30,
-                        'older_count': 0,
-                        'error': str(e)
-                    }
+                    logger.warning(f"Estimated table stats unavailable, counting exactly: {e}")
+
+            try:
+                if detailed_stats is None:
+                    detailed_stats = await asyncio.to_thread(self._get_all_table_age_stats, cutoffs)
+            except Exception as e:
+                # One failing table (e.g. a missing archive table) fails the combined query;
+                # fall back to per-table queries so the other tables are still reported
+                logger.warning(f"Combined table stats query failed, counting tables individually: {e}")
+                
+                # The counts are independent reads, so run each table on its own pooled connection
+                table_stats = await asyncio.gather(*(
+                    asyncio.to_thread(self._get_table_age_stats, table_info, cutoffs[table_info['older_than_days']])
+                    for table_info in DETAILED_STATS_TABLES
+                ))
+                detailed_stats = {
+                    table_info['name']: stats
+                    for table_info, stats in zip(DETAILED_STATS_TABLES, table_stats)
+                }
             
             return {
                 "success": True,
                 "detailed_stats": detailed_stats,
+                "totals_are_estimates": any(stats.get('total_is_estimate', False) for stats in detailed_stats.values()),
                 "generated_at": datetime.now().isoformat(),
                 "cutoff_dates": {
                     "seven_days_ago": seven_days_ago,
@@ -379,10 +457,17 @@ class DatabaseService:
                 
                 # Safety check for 30-day minimum age for delete operations
                 min_delete_date = datetime.now() - timedelta(days=30)
+                # YYYYMMDD prefixes order lexically like dates, so compare strings and
+                # only parse the (rare) values that fail the check. Values that are not
+                # YYYYMMDD dates are not checked here, as before.
+                min_delete_date_str = min_delete_date.strftime("%Y%m%d")
                 for key, value in filters.items():
                     if "time" in key.lower() and isinstance(value, str) and len(value) >= 8:
+                        date_prefix = value[:8]
+                        if not (date_prefix.isdigit() and date_prefix > min_delete_date_str):
+                            continue
                         try:
-                            filter_date = datetime.strptime(value[:8], "%Y%m%d")
+                            filter_date = datetime.strptime(date_prefix, "%Y%m%d")
                             if filter_date > min_delete_date:
                                 return {
                                     "success": False,
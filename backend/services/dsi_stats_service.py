@@ -1,63 +1,208 @@
 """DSI Transaction Statistics Service"""
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func, and_, or_, desc
+from sqlalchemy import text, func, and_, or_, desc, select, literal, case
 from models.transactions import DSITransactionLog, ArchiveDSITransactionLog
 from datetime import datetime, timedelta
+from functools import lru_cache
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Union
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union
 import re
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when streaming log listings
+STREAM_BATCH_SIZE = 500
+
+# Characters shown for payload and error previews before they are cut with '...'
+_DATA_PREVIEW_LENGTH = 200
+_ERROR_PREVIEW_LENGTH = 100
+
+def _has_error(model):
+    """1 when the row carries a non-blank ErrorsOut, computed in SQL"""
+    return case(
+        (and_(model.ErrorsOut.isnot(None), func.length(func.trim(model.ErrorsOut)) > 0), 1),
+        else_=0
+    ).label('has_error')
+
+# Columns each log listing formats; selecting only these skips ORM hydration and
+# keeps the DataIn/DataOut payloads off the wire where they are not shown.
+# (name, length) entries are cut to one character past the preview length in SQL,
+# which is enough to tell whether the value was longer. Callables build derived columns.
+_INSTANCE_ERROR_COLUMNS = (
+    'RecordID', 'DeviceID', 'UserID', 'WhenReceived', 'WhenProcessed',
+    'FunctionCallID', 'ErrorsOut', 'AppID', 'ElapsedTime'
+)
+_ERROR_WINDOW_COLUMNS = (
+    'RecordID', 'DeviceID', 'UserID', 'WhenReceived', 'FunctionCallID',
+    'FunctionCallRC', 'ErrorsOut', 'AppID', 'ElapsedTime', _has_error
+)
+_DATETIME_WINDOW_COLUMNS = _ERROR_WINDOW_COLUMNS + (
+    ('DataIn', _DATA_PREVIEW_LENGTH), ('DataOut', _DATA_PREVIEW_LENGTH)
+)
+_FILTERED_LOG_COLUMNS = (
+    'RecordID', 'DeviceID', 'UserID', 'WhenReceived', 'FunctionCallID',
+    'AppID', ('ErrorsOut', _ERROR_PREVIEW_LENGTH), 'ElapsedTime', _has_error
+)
+
+_DAYS_RE = re.compile(r'(\d+)\s*days?')
+_WEEKS_RE = re.compile(r'(\d+)\s*weeks?')
+_MONTHS_RE = re.compile(r'(\d+)\s*months?')
+
+# Common period strings resolved with a single lookup before any regex parsing
+_PERIOD_TABLE = {
+    'yesterday': timedelta(days=1),
+    'last day': timedelta(days=1),
+    'last 1 day': timedelta(days=1),
+    'last 5 days': timedelta(days=5),
+    'last 7 days': timedelta(days=7),
+    'last 30 days': timedelta(days=30),
+    'last week': timedelta(weeks=1),
+    'last month': timedelta(days=30)
+}
+
+@lru_cache(maxsize=64)
+def _parse_period_delta(period_str: str) -> timedelta:
+    """Parse a time period string ("last 5 days") to how far back it reaches.
+    
+    Only the delta is cached, so callers still subtract it from the current time.
+    """
+    period_str = period_str.lower().strip()
+    
+    known_delta = _PERIOD_TABLE.get(period_str)
+    if known_delta is not None:
+        return known_delta
+    
+    # Handle different time period formats
+    if 'last' in period_str:
+        if 'day' in period_str:
+            match = _DAYS_RE.search(period_str)
+            if match:
+                return timedelta(days=int(match.group(1)))
+            elif 'yesterday' in period_str:
+                return timedelta(days=1)
+        elif 'week' in period_str:
+            match = _WEEKS_RE.search(period_str)
+            if match:
+                return timedelta(weeks=int(match.group(1)))
+        elif 'month' in period_str:
+            match = _MONTHS_RE.search(period_str)
+            if match:
+                return timedelta(days=int(match.group(1)) * 30)
+    
+    # Default to 5 days if not parseable
+    return timedelta(days=5)
+
+# Aggregated error stats, reused while dashboards refresh the same window
+_STATS_CACHE_TTL_SECONDS = 60
+_STATS_CACHE_MAX_ENTRIES = 512
+_stats_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+
+def _get_cached_stats(key: Tuple) -> Optional[Dict[str, Any]]:
+    """Return a cached stats result that has not expired"""
+    entry = _stats_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > _STATS_CACHE_TTL_SECONDS:
+        _stats_cache.pop(key, None)
+        return None
+    return dict(result)
+
+def _store_cached_stats(key: Tuple, result: Dict[str, Any]) -> None:
+    """Cache a stats result, evicting the oldest entry when full"""
+    _stats_cache.pop(key, None)
+    if len(_stats_cache) >= _STATS_CACHE_MAX_ENTRIES:
+        _stats_cache.pop(next(iter(_stats_cache)), None)
+    _stats_cache[key] = (time.monotonic(), dict(result))
+
+def _columns(model, names):
+    """Resolve column names against a main or archive transaction log model"""
+    columns = []
+    for name in names:
+        if callable(name):
+            columns.append(name(model))
+        elif isinstance(name, tuple):
+            name, preview_length = name
+            columns.append(func.substr(getattr(model, name), 1, preview_length + 1).label(name))
+        else:
+            columns.append(getattr(model, name))
+    return columns
+
 class DSIStatsService:
     """Service for statistical analysis of DSI transaction logs"""
     
     def __init__(self, db: Session):
         self.db = db
     
+    def _fetch_records(self, query, format_record) -> List[Dict[str, Any]]:
+        """Stream a read-only query on a short-lived session, formatting rows as they arrive"""
+        with Session(bind=self.db.get_bind()) as session:
+            records = session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+            return [format_record(record) for record in records]
+    
+    def _union_query(self, columns, build_filter):
+        """UNION ALL of the same columns and filter over the main and archive tables.
+        
+        build_filter(model) returns the WHERE conditions for either table, so callers
+        describe their filter once. Each row carries a table_source column naming the
+        table it came from; main and archive rows are disjoint, so no dedup pass is needed.
+        """
+        main_query = select(
+            *_columns(DSITransactionLog, columns), literal('main').label('table_source')
+        ).where(*build_filter(DSITransactionLog))
+        archive_query = select(
+            *_columns(ArchiveDSITransactionLog, columns), literal('archive').label('table_source')
+        ).where(*build_filter(ArchiveDSITransactionLog))
+        return main_query.union_all(archive_query).subquery()
+    
+    async def _fetch_main_and_archive(
+        self, columns, build_filter, format_record, newest_first: bool = False, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Read main and archive rows with one statement ordered (and limited) by WhenReceived in SQL"""
+        combined = self._union_query(columns, build_filter)
+        query = select(combined).order_by(
+            desc(combined.c.WhenReceived) if newest_first else combined.c.WhenReceived
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return await asyncio.to_thread(self._fetch_records, query, format_record)
+    
+    def _count_records(self, model, build_filter) -> int:
+        """COUNT(*) of one table's rows matching a _union_query-style filter"""
+        with Session(bind=self.db.get_bind()) as session:
+            return session.execute(
+                select(func.count()).select_from(model).where(*build_filter(model))
+            ).scalar_one()
+    
     def _parse_time_period(self, period_str: str) -> datetime:
         """Parse time period string to datetime cutoff"""
-        period_str = period_str.lower().strip()
-        now = datetime.now()
-        
-        # Handle different time period formats
-        if 'last' in period_str:
-            if 'day' in period_str:
-                match = re.search(r'(\d+)\s*days?', period_str)
-                if match:
-                    days = int(match.group(1))
-                    return now - timedelta(days=days)
-                elif 'yesterday' in period_str:
-                    return now - timedelta(days=1)
-            elif 'week' in period_str:
-                match = re.search(r'(\d+)\s*weeks?', period_str)
-                if match:
-                    weeks = int(match.group(1))
-                    return now - timedelta(weeks=weeks)
-            elif 'month' in period_str:
-                match = re.search(r'(\d+)\s*months?', period_str)
-                if match:
-                    months = int(match.group(1))
-                    return now - timedelta(days=months * 30)
-        
-        # Default to 5 days if not parseable
-        return now - timedelta(days=5)
+        return datetime.now() - _parse_period_delta(period_str)
     
     def _format_db_datetime(self, dt: datetime) -> str:
         """Format datetime to database string format (YYYYMMDDHHMMSS)"""
-        return dt.strftime('%Y%m%d%H%M%S')
+        # Fixed-width fields, so build the string directly instead of interpreting a strftime format
+        return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
     
     def _parse_db_datetime(self, db_time_str: str) -> datetime:
         """Parse database datetime string to datetime object"""
         if not db_time_str:
             return None
+        s = db_time_str
         try:
+            # Fixed-width digit fields are sliced directly; non-digit or out-of-range
+            # values raise ValueError just like strptime would
             # Handle YYYYMMDDHHMMSS format
-            if len(db_time_str) >= 14:
-                return datetime.strptime(db_time_str[:14], '%Y%m%d%H%M%S')
+            if len(s) >= 14:
+                if not s[:14].isdigit():
+                    raise ValueError(s)
+                return datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]), int(s[8:10]), int(s[10:12]), int(s[12:14]))
             # Handle YYYYMMDD format
-            elif len(db_time_str) >= 8:
-                return datetime.strptime(db_time_str[:8], '%Y%m%d')
+            elif len(s) >= 8:
+                if not s[:8].isdigit():
+                    raise ValueError(s)
+                return datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]))
         except ValueError:
             logger.warning(f"Could not parse datetime string: {db_time_str}")
         return None
@@ -69,58 +214,38 @@ class DSIStatsService:
         limit: int = 10
     ) -> Dict[str, Any]:
         """Get most occurring errors in the specified time period"""
+        # Keyed by engine too, since each region has its own database
+        cache_key = ('most_occurring_errors', self.db.get_bind(), period, instance_id, limit)
+        cached = _get_cached_stats(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             cutoff_date = self._parse_time_period(period)
             cutoff_str = self._format_db_datetime(cutoff_date)
             
-            # Query both main and archive tables
-            queries = []
-            
-            # Main table query
-            main_query = self.db.query(
-                DSITransactionLog.ErrorsOut,
-                DSITransactionLog.DeviceID,
-                func.count().label('error_count')
-            ).filter(
-                and_(
-                    DSITransactionLog.ErrorsOut.isnot(None),
-                    DSITransactionLog.ErrorsOut != '',
-                    DSITransactionLog.WhenReceived >= cutoff_str
-                )
-            )
-            
-            if instance_id:
-                main_query = main_query.filter(DSITransactionLog.DeviceID == instance_id)
-            
-            main_query = main_query.group_by(
-                DSITransactionLog.ErrorsOut, 
-                DSITransactionLog.DeviceID
-            )
-            
-            # Archive table query
-            archive_query = self.db.query(
-                ArchiveDSITransactionLog.ErrorsOut,
-                ArchiveDSITransactionLog.DeviceID,
-                func.count().label('error_count')
-            ).filter(
-                and_(
-                    ArchiveDSITransactionLog.ErrorsOut.isnot(None),
-                    ArchiveDSITransactionLog.ErrorsOut != '',
-                    ArchiveDSITransactionLog.WhenReceived >= cutoff_str
-                )
-            )
-            
-            if instance_id:
-                archive_query = archive_query.filter(ArchiveDSITransactionLog.DeviceID == instance_id)
-            
-            archive_query = archive_query.group_by(
-                ArchiveDSITransactionLog.ErrorsOut, 
-                ArchiveDSITransactionLog.DeviceID
-            )
-            
-            # Union and get results
-            union_query = main_query.union(archive_query)
-            results = union_query.order_by(desc('error_count')).limit(limit).all()
+            def error_filter(model):
+                conditions = [
+                    model.ErrorsOut.isnot(None),
+                    model.ErrorsOut != '',
+                    model.WhenReceived >= cutoff_str
+                ]
+                if instance_id:
+                    conditions.append(model.DeviceID == instance_id)
+                return conditions
+            
+            # A single aggregation over both tables' matching rows counts each error once
+            combined = self._union_query(('ErrorsOut', 'DeviceID'), error_filter)
+            results = self.db.execute(
+                select(
+                    combined.c.ErrorsOut,
+                    combined.c.DeviceID,
+                    func.count().label('error_count')
+                ).group_by(
+                    combined.c.ErrorsOut,
+                    combined.c.DeviceID
+                ).order_by(desc('error_count')).limit(limit)
+            ).all()
             
             # Format results
             errors = []
@@ -132,13 +257,15 @@ class DSIStatsService:
                     'error_preview': result.ErrorsOut[:100] + '...' if len(result.ErrorsOut) > 100 else result.ErrorsOut
                 })
             
-            return {
+            result = {
                 'success': True,
                 'period': period,
                 'instance_filter': instance_id,
                 'total_errors_found': len(errors),
                 'errors': errors
             }
+            _store_cached_stats(cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error getting most occurring errors: {e}")
@@ -173,32 +300,18 @@ class DSIStatsService:
             start_str = self._format_db_datetime(start_time)
             end_str = self._format_db_datetime(end_time)
             
-            # Query both tables
-            main_results = self.db.query(DSITransactionLog).filter(
-                and_(
-                    DSITransactionLog.DeviceID == instance_id,
-                    DSITransactionLog.ErrorsOut.isnot(None),
-                    DSITransactionLog.ErrorsOut != '',
-                    DSITransactionLog.WhenReceived >= start_str,
-                    DSITransactionLog.WhenReceived <= end_str
-                )
-            ).order_by(DSITransactionLog.WhenReceived).all()
-            
-            archive_results = self.db.query(ArchiveDSITransactionLog).filter(
-                and_(
-                    ArchiveDSITransactionLog.DeviceID == instance_id,
-                    ArchiveDSITransactionLog.ErrorsOut.isnot(None),
-                    ArchiveDSITransactionLog.ErrorsOut != '',
-                    ArchiveDSITransactionLog.WhenReceived >= start_str,
-                    ArchiveDSITransactionLog.WhenReceived <= end_str
-                )
-            ).order_by(ArchiveDSITransactionLog.WhenReceived).all()
-            
-            # Combine and format results
-            all_errors = []
-            
-            for record in main_results + archive_results:
-                all_errors.append({
+            def error_filter(model):
+                return [
+                    model.DeviceID == instance_id,
+                    model.ErrorsOut.isnot(None),
+                    model.ErrorsOut != '',
+                    model.WhenReceived >= start_str,
+                    model.WhenReceived <= end_str
+                ]
+            
+            # Combine and format results (rows are formatted as they stream in)
+            def format_record(record):
+                return {
                     'record_id': record.RecordID,
                     'instance_id': record.DeviceID,
                     'user_id': record.UserID,
@@ -208,12 +321,11 @@ class DSIStatsService:
                     'error_message': record.ErrorsOut,
                     'app_id': record.AppID,
                     'elapsed_time': record.ElapsedTime,
-                    'table_source': 'main' if record in main_results else 'archive'
-                })
-            
-            # Sort by when_received
-            all_errors.sort(key=lambda x: x['when_received'])
-            
+                    'table_source': record.table_source
+                }
+
+            all_errors = await self._fetch_main_and_archive(_INSTANCE_ERROR_COLUMNS, error_filter, format_record)
+
             return {
                 'success': True,
                 'instance_id': instance_id,
@@ -256,27 +368,17 @@ class DSIStatsService:
             start_str = self._format_db_datetime(start_time)
             end_str = self._format_db_datetime(end_time)
             
-            # Query both tables for all logs in the time window
-            main_results = self.db.query(DSITransactionLog).filter(
-                and_(
-                    DSITransactionLog.DeviceID == instance_id,
-                    DSITransactionLog.WhenReceived >= start_str,
-                    DSITransactionLog.WhenReceived <= end_str
-                )
-            ).order_by(DSITransactionLog.WhenReceived).all()
-            
-            archive_results = self.db.query(ArchiveDSITransactionLog).filter(
-                and_(
-                    ArchiveDSITransactionLog.DeviceID == instance_id,
-                    ArchiveDSITransactionLog.WhenReceived >= start_str,
-                    ArchiveDSITransactionLog.WhenReceived <= end_str
-                )
-            ).order_by(ArchiveDSITransactionLog.WhenReceived).all()
+            # All logs for the instance in the time window
+            def window_filter(model):
+                return [
+                    model.DeviceID == instance_id,
+                    model.WhenReceived >= start_str,
+                    model.WhenReceived <= end_str
+                ]
             
-            # Format results
-            all_logs = []
-            for record in main_results + archive_results:
-                all_logs.append({
+            # Format results (rows are formatted as they stream in)
+            def format_record(record):
+                return {
                     'record_id': record.RecordID,
                     'instance_id': record.DeviceID,
                     'user_id': record.UserID,
@@ -286,13 +388,12 @@ class DSIStatsService:
                     'error_message': record.ErrorsOut if record.ErrorsOut else None,
                     'app_id': record.AppID,
                     'elapsed_time': record.ElapsedTime,
-                    'has_error': bool(record.ErrorsOut and record.ErrorsOut.strip()),
-                    'table_source': 'main' if record in main_results else 'archive'
-                })
-            
-            # Sort by when_received
-            all_logs.sort(key=lambda x: x['when_received'])
-            
+                    'has_error': bool(record.has_error),
+                    'table_source': record.table_source
+                }
+
+            all_logs = await self._fetch_main_and_archive(_ERROR_WINDOW_COLUMNS, window_filter, format_record)
+
             return {
                 'success': True,
                 'instance_id': instance_id,
@@ -316,38 +417,31 @@ class DSIStatsService:
         limit: int = 10
     ) -> Dict[str, Any]:
         """Get users who caused most errors for a specific instance"""
+        cache_key = ('users_with_most_errors', self.db.get_bind(), period, instance_id, limit)
+        cached = _get_cached_stats(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             cutoff_date = self._parse_time_period(period)
             cutoff_str = self._format_db_datetime(cutoff_date)
             
-            # Query both tables
-            main_query = self.db.query(
-                DSITransactionLog.UserID,
-                func.count().label('error_count')
-            ).filter(
-                and_(
-                    DSITransactionLog.DeviceID == instance_id,
-                    DSITransactionLog.ErrorsOut.isnot(None),
-                    DSITransactionLog.ErrorsOut != '',
-                    DSITransactionLog.WhenReceived >= cutoff_str
-                )
-            ).group_by(DSITransactionLog.UserID)
-            
-            archive_query = self.db.query(
-                ArchiveDSITransactionLog.UserID,
-                func.count().label('error_count')
-            ).filter(
-                and_(
-                    ArchiveDSITransactionLog.DeviceID == instance_id,
-                    ArchiveDSITransactionLog.ErrorsOut.isnot(None),
-                    ArchiveDSITransactionLog.ErrorsOut != '',
-                    ArchiveDSITransactionLog.WhenReceived >= cutoff_str
-                )
-            ).group_by(ArchiveDSITransactionLog.UserID)
-            
-            # Union and aggregate
-            union_query = main_query.union(archive_query)
-            results = union_query.order_by(desc('error_count')).limit(limit).all()
+            def error_filter(model):
+                return [
+                    model.DeviceID == instance_id,
+                    model.ErrorsOut.isnot(None),
+                    model.ErrorsOut != '',
+                    model.WhenReceived >= cutoff_str
+                ]
+            
+            # Aggregate the matching rows of both tables per user once
+            combined = self._union_query(('UserID',), error_filter)
+            results = self.db.execute(
+                select(
+                    combined.c.UserID,
+                    func.count().label('error_count')
+                ).group_by(combined.c.UserID).order_by(desc('error_count')).limit(limit)
+            ).all()
             
             users = []
             for result in results:
@@ -356,13 +450,15 @@ class DSIStatsService:
                     'error_count': result.error_count
                 })
             
-            return {
+            result = {
                 'success': True,
                 'instance_id': instance_id,
                 'period': period,
                 'total_users_with_errors': len(users),
                 'users': users
             }
+            _store_cached_stats(cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error getting users with most errors: {e}")
@@ -401,31 +497,20 @@ class DSIStatsService:
             start_str = self._format_db_datetime(start_time)
             end_str = self._format_db_datetime(end_time)
             
-            # Build queries with optional user filter
-            main_filter = and_(
-                DSITransactionLog.DeviceID == instance_id,
-                DSITransactionLog.WhenReceived >= start_str,
-                DSITransactionLog.WhenReceived <= end_str
-            )
-            
-            archive_filter = and_(
-                ArchiveDSITransactionLog.DeviceID == instance_id,
-                ArchiveDSITransactionLog.WhenReceived >= start_str,
-                ArchiveDSITransactionLog.WhenReceived <= end_str
-            )
-            
-            if user_id:
-                main_filter = and_(main_filter, DSITransactionLog.UserID == user_id)
-                archive_filter = and_(archive_filter, ArchiveDSITransactionLog.UserID == user_id)
-            
-            # Execute queries
-            main_results = self.db.query(DSITransactionLog).filter(main_filter).order_by(DSITransactionLog.WhenReceived).all()
-            archive_results = self.db.query(ArchiveDSITransactionLog).filter(archive_filter).order_by(ArchiveDSITransactionLog.WhenReceived).all()
-            
-            # Format results
-            all_logs = []
-            for record in main_results + archive_results:
-                all_logs.append({
+            # Build the window filter with optional user filter
+            def window_filter(model):
+                conditions = [
+                    model.DeviceID == instance_id,
+                    model.WhenReceived >= start_str,
+                    model.WhenReceived <= end_str
+                ]
+                if user_id:
+                    conditions.append(model.UserID == user_id)
+                return conditions
+            
+            # Format results (rows are formatted as they stream in)
+            def format_record(record):
+                return {
                     'record_id': record.RecordID,
                     'instance_id': record.DeviceID,
                     'user_id': record.UserID,
@@ -434,15 +519,19 @@ class DSIStatsService:
                     'function_call_rc': record.FunctionCallRC,
                     'app_id': record.AppID,
                     'error_message': record.ErrorsOut if record.ErrorsOut else None,
-                    'data_in': record.DataIn[:200] + '...' if record.DataIn and len(record.DataIn) > 200 else record.DataIn,
-                    'data_out': record.DataOut[:200] + '...' if record.DataOut and len(record.DataOut) > 200 else record.DataOut,
+                    'data_in': record.DataIn[:_DATA_PREVIEW_LENGTH] + '...' if record.DataIn and len(record.DataIn) > _DATA_PREVIEW_LENGTH else record.DataIn,
+                    'data_out': record.DataOut[:_DATA_PREVIEW_LENGTH] + '...' if record.DataOut and len(record.DataOut) > _DATA_PREVIEW_LENGTH else record.DataOut,
                     'elapsed_time': record.ElapsedTime,
-                    'has_error': bool(record.ErrorsOut and record.ErrorsOut.strip()),
-                    'table_source': 'main' if record in main_results else 'archive'
-                })
-            
-            # Sort by when_received
-            all_logs.sort(key=lambda x: x['when_received'])
+                    'has_error': bool(record.has_error),
+                    'table_source': record.table_source
+                }
+
+            # Execute queries
+            all_logs = await self._fetch_main_and_archive(
+                _DATETIME_WINDOW_COLUMNS,
+                window_filter,
+                format_record
+            )
             
             return {
                 'success': True,
@@ -468,68 +557,65 @@ class DSIStatsService:
         app_id: str = None,
         period: str = "last 7 days",
         has_errors_only: bool = False,
-        limit: int = 100
+        limit: int = 100,
+        include_total: bool = False
     ) -> Dict[str, Any]:
-        """Get logs filtered by multiple criteria"""
+        """Get logs filtered by multiple criteria
+        
+        total_logs is the number of rows returned (at most limit). With include_total,
+        total_matched also reports how many rows match the filters across both tables.
+        """
         try:
             cutoff_date = self._parse_time_period(period)
             cutoff_str = self._format_db_datetime(cutoff_date)
             
             # Build filters
-            main_filters = [DSITransactionLog.WhenReceived >= cutoff_str]
-            archive_filters = [ArchiveDSITransactionLog.WhenReceived >= cutoff_str]
-            
-            if instance_id:
-                main_filters.append(DSITransactionLog.DeviceID == instance_id)
-                archive_filters.append(ArchiveDSITransactionLog.DeviceID == instance_id)
-            
-            if user_id:
-                main_filters.append(DSITransactionLog.UserID == user_id)
-                archive_filters.append(ArchiveDSITransactionLog.UserID == user_id)
-            
-            if app_id:
-                main_filters.append(DSITransactionLog.AppID == app_id)
-                archive_filters.append(ArchiveDSITransactionLog.AppID == app_id)
-            
-            if has_errors_only:
-                main_filters.extend([
-                    DSITransactionLog.ErrorsOut.isnot(None),
-                    DSITransactionLog.ErrorsOut != ''
-                ])
-                archive_filters.extend([
-                    ArchiveDSITransactionLog.ErrorsOut.isnot(None),
-                    ArchiveDSITransactionLog.ErrorsOut != ''
-                ])
-            
-            # Execute queries
-            main_results = self.db.query(DSITransactionLog).filter(
-                and_(*main_filters)
-            ).order_by(desc(DSITransactionLog.WhenReceived)).limit(limit//2 if limit > 1 else 1).all()
-            
-            archive_results = self.db.query(ArchiveDSITransactionLog).filter(
-                and_(*archive_filters)
-            ).order_by(desc(ArchiveDSITransactionLog.WhenReceived)).limit(limit//2 if limit > 1 else 1).all()
-            
-            # Format results
-            all_logs = []
-            for record in main_results + archive_results:
-                all_logs.append({
+            def log_filter(model):
+                conditions = [model.WhenReceived >= cutoff_str]
+                if instance_id:
+                    conditions.append(model.DeviceID == instance_id)
+                if user_id:
+                    conditions.append(model.UserID == user_id)
+                if app_id:
+                    conditions.append(model.AppID == app_id)
+                if has_errors_only:
+                    conditions.extend([
+                        model.ErrorsOut.isnot(None),
+                        model.ErrorsOut != ''
+                    ])
+                return conditions
+            
+            # Format results (rows are formatted as they stream in)
+            def format_record(record):
+                return {
                     'record_id': record.RecordID,
                     'instance_id': record.DeviceID,
                     'user_id': record.UserID,
                     'when_received': record.WhenReceived,
                     'function_call_id': record.FunctionCallID,
                     'app_id': record.AppID,
-                    'error_message': record.ErrorsOut[:100] + '...' if record.ErrorsOut and len(record.ErrorsOut) > 100 else record.ErrorsOut,
+                    'error_message': record.ErrorsOut[:_ERROR_PREVIEW_LENGTH] + '...' if record.ErrorsOut and len(record.ErrorsOut) > _ERROR_PREVIEW_LENGTH else record.ErrorsOut,
                     'elapsed_time': record.ElapsedTime,
-                    'has_error': bool(record.ErrorsOut and record.ErrorsOut.strip()),
-                    'table_source': 'main' if record in main_results else 'archive'
-                })
-            
-            # Sort by when_received (newest first)
-            all_logs.sort(key=lambda x: x['when_received'], reverse=True)
+                    'has_error': bool(record.has_error),
+                    'table_source': record.table_source
+                }
+
+            # Execute queries; matched counts run alongside the listing when requested
+            fetches = [self._fetch_main_and_archive(
+                _FILTERED_LOG_COLUMNS,
+                log_filter,
+                format_record,
+                newest_first=True,
+                limit=limit
+            )]
+            if include_total:
+                fetches.extend(
+                    asyncio.to_thread(self._count_records, model, log_filter)
+                    for model in (DSITransactionLog, ArchiveDSITransactionLog)
+                )
+            all_logs, *table_counts = await asyncio.gather(*fetches)
             
-            return {
+            result = {
                 'success': True,
                 'filters': {
                     'instance_id': instance_id,
@@ -539,8 +625,11 @@ class DSIStatsService:
                     'errors_only': has_errors_only
                 },
                 'total_logs': len(all_logs),
-                'logs': all_logs[:limit]  # Apply final limit
+                'logs': all_logs
             }
+            if include_total:
+                result['total_matched'] = sum(table_counts)
+            return result
             
         except Exception as e:
             logger.error(f"Error getting filtered logs: {e}")
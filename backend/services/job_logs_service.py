@@ -1,15 +1,104 @@
 """Job Logs service for querying job execution history"""
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, and_, or_, func
+from sqlalchemy import desc, asc, and_, or_, func, select, case, literal, union_all, extract, literal_column, type_coerce, Float
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from functools import lru_cache
+import base64
+import json
 import logging
+import operator
 import re
 
 from models.job_logs import JobLogs
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when streaming job log listings
+STREAM_BATCH_SIZE = 200
+
+# Columns returned by query_job_logs; selected directly so rows skip ORM hydration
+_RECORD_COLUMNS = (
+    JobLogs.id,
+    JobLogs.schema_name,
+    JobLogs.job_type,
+    JobLogs.table_name,
+    JobLogs.status,
+    JobLogs.source,
+    JobLogs.reason,
+    JobLogs.records_affected
+)
+
+# Fields query_job_logs may order by: any job_logs column, never other model attributes
+_ORDERABLE = {column.key: column for column in JobLogs.__table__.columns}
+
+# started_at/finished_at as ISO strings and finished_at - started_at in seconds,
+# computed in SQL where the dialect supports it (NULL when a timestamp is missing).
+# Other dialects select the raw timestamps and format them in Python.
+_POSTGRES_ISO_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.US'
+_MYSQL_ISO_FORMAT = '%Y-%m-%dT%H:%i:%s.%f'
+_SQL_FORMATTED_COLUMNS = {
+    "postgresql": (
+        func.to_char(JobLogs.started_at, _POSTGRES_ISO_FORMAT).label('started_at'),
+        func.to_char(JobLogs.finished_at, _POSTGRES_ISO_FORMAT).label('finished_at'),
+        type_coerce(
+            extract('epoch', JobLogs.finished_at - JobLogs.started_at), Float
+        ).label('duration_seconds')
+    ),
+    "mysql": (
+        func.date_format(JobLogs.started_at, _MYSQL_ISO_FORMAT).label('started_at'),
+        func.date_format(JobLogs.finished_at, _MYSQL_ISO_FORMAT).label('finished_at'),
+        type_coerce(
+            func.timestampdiff(literal_column('MICROSECOND'), JobLogs.started_at, JobLogs.finished_at) / 1000000, Float
+        ).label('duration_seconds')
+    ),
+}
+_SQL_FORMATTED_COLUMNS["mariadb"] = _SQL_FORMATTED_COLUMNS["mysql"]
+
+# Natural language date_range expressions: "last 45 min", "last 2 hours"
+_LAST_MINUTES_RE = re.compile(r'last\s+(\d+)\s+min(?:ute)?s?')
+_LAST_HOURS_RE = re.compile(r'last\s+(\d+)\s+hours?')
+
+# Custom date_range "from_9_15_2025_to_9_30_2025" (month, day, year; '/' also accepted)
+_CUSTOM_RANGE_RE = re.compile(
+    r'from_(\d{1,2})[_/](\d{1,2})[_/](\d{4})_to_(\d{1,2})[_/](\d{1,2})[_/](\d{4})'
+)
+
+# Filter keys matched against a column by value, or by any of a list of values
+_EQ_COLUMNS = {
+    "status": JobLogs.status,
+    "job_type": JobLogs.job_type,
+    "table_name": JobLogs.table_name,
+    "schema_name": JobLogs.schema_name,
+    "source": JobLogs.source,
+    "id": JobLogs.id,
+}
+
+# ISO date bound filters: filter key, column, comparison
+_DATE_BOUNDS = (
+    ("started_after", JobLogs.started_at, operator.ge),
+    ("started_before", JobLogs.started_at, operator.le),
+    ("finished_after", JobLogs.finished_at, operator.ge),
+    ("finished_before", JobLogs.finished_at, operator.le),
+)
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO timestamp, accepting a trailing 'Z'; polling dashboards repeat the same bounds"""
+    return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+
+def _encode_cursor(started_at: str, job_id: int) -> str:
+    """Opaque keyset cursor pointing just past the given (ISO started_at, id) row"""
+    return base64.urlsafe_b64encode(json.dumps([started_at, job_id]).encode()).decode()
+
+def _decode_cursor(cursor: str):
+    """Decode a cursor from _encode_cursor back to (started_at, id); raises ValueError if malformed"""
+    try:
+        started_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(started_at), int(job_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 class JobLogsService:
     """Service for querying job logs with various filters"""
     
@@ -22,7 +111,9 @@ class JobLogsService:
         limit: int = 100,
         offset: int = 0,
         order_by: str = "started_at",
-        order_direction: str = "desc"
+        order_direction: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> Dict[str, Any]:
         """
         Query job logs with various filters
@@ -31,40 +122,79 @@ class JobLogsService:
             filters: Dict containing filter criteria
             limit: Maximum number of records to return
             offset: Number of records to skip
-            order_by: Field to order by
+            order_by: Field to order by (any job_logs column, e.g. started_at or status)
             order_direction: 'asc' or 'desc'
+            cursor: next_cursor from a previous page; seeks past that row instead of
+                skipping offset rows, always orders by started_at desc, and skips total_count
+            include_total: Also COUNT(*) every matching row for total_count; leave off
+                for paginated UIs using cursors, where it costs more than the page itself
             
         Returns:
             Dict containing query results and metadata
+            
+        Raises:
+            ValueError: If order_by is not a job_logs column or cursor is malformed
         """
+        # Invalid client input is raised rather than reported as a failed query
+        if order_by not in _ORDERABLE:
+            raise ValueError(f"Cannot order job logs by '{order_by}'. Use one of: {', '.join(_ORDERABLE)}")
+        cursor_position = _decode_cursor(cursor) if cursor else None
+        
         try:
             # Start with base query
-            query = self.db.query(JobLogs)
+            formatted_columns = _SQL_FORMATTED_COLUMNS.get(self.db.get_bind().dialect.name)
+            if formatted_columns is not None:
+                query = select(*_RECORD_COLUMNS, *formatted_columns)
+            else:
+                query = select(*_RECORD_COLUMNS, JobLogs.started_at, JobLogs.finished_at)
             
             # Apply filters if provided
             if filters:
                 query = self._apply_filters(query, filters)
             
-            # Get total count before applying pagination
-            total_count = query.count()
+            if cursor_position:
+                # Keyset pagination: seek past the previous page's last row through the
+                # (started_at, id) order instead of scanning and discarding offset rows
+                cursor_started_at, cursor_id = cursor_position
+                query = query.filter(
+                    or_(
+                        JobLogs.started_at < cursor_started_at,
+                        and_(JobLogs.started_at == cursor_started_at, JobLogs.id < cursor_id)
+                    )
+                )
+                order_by, order_direction, offset = "started_at", "desc", 0
+            
+            # Count all matches only when asked, and never for cursor pages
+            total_count = None
+            if include_total and not cursor:
+                total_count = self.db.execute(
+                    select(func.count()).select_from(query.subquery())
+                ).scalar_one()
             
             # Apply ordering
-            if hasattr(JobLogs, order_by):
-                order_field = getattr(JobLogs, order_by)
-                if order_direction.lower() == "desc":
-                    query = query.order_by(desc(order_field))
-                else:
-                    query = query.order_by(asc(order_field))
+            keyset_order = order_by == "started_at" and order_direction.lower() == "desc"
+            order_field = _ORDERABLE[order_by]
+            if order_direction.lower() == "desc":
+                query = query.order_by(desc(order_field))
+            else:
+                query = query.order_by(asc(order_field))
+            if keyset_order:
+                # Tie-break equal start times so cursors resume at an exact row
+                query = query.order_by(desc(JobLogs.id))
             
             # Apply pagination
             query = query.offset(offset).limit(limit)
             
-            # Execute query
-            records = query.all()
-            
-            # Convert to dictionaries
+            # Execute query, converting rows to dictionaries as they stream in
+            records = self.db.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
             result_records = []
             for record in records:
+                if formatted_columns is not None:
+                    started_at, finished_at, duration_seconds = record.started_at, record.finished_at, record.duration_seconds
+                else:
+                    started_at = record.started_at.isoformat() if record.started_at else None
+                    finished_at = record.finished_at.isoformat() if record.finished_at else None
+                    duration_seconds = self._calculate_duration(record.started_at, record.finished_at)
                 result_records.append({
                     "id": record.id,
                     "schema_name": record.schema_name,
@@ -74,16 +204,22 @@ class JobLogsService:
                     "source": record.source,
                     "reason": record.reason,
                     "records_affected": record.records_affected,
-                    "started_at": record.started_at.isoformat() if record.started_at else None,
-                    "finished_at": record.finished_at.isoformat() if record.finished_at else None,
-                    "duration_seconds": self._calculate_duration(record.started_at, record.finished_at)
+                    "started_at": started_at,
+                    "finished_at": finished_at,
+                    "duration_seconds": duration_seconds
                 })
             
+            # A full page in started_at desc order can be continued with a cursor
+            next_cursor = None
+            if keyset_order and result_records and len(result_records) == limit and result_records[-1]["started_at"]:
+                next_cursor = _encode_cursor(result_records[-1]["started_at"], result_records[-1]["id"])
+            
             return {
                 "success": True,
                 "records": result_records,
                 "total_count": total_count,
                 "returned_count": len(result_records),
+                "next_cursor": next_cursor,
                 "offset": offset,
                 "limit": limit,
                 "filters_applied": filters or {},
@@ -106,53 +242,12 @@ class JobLogsService:
         # Get current datetime for all time-based filters
         now = datetime.now()
         
-        # Status filter
-        if "status" in filters:
-            status = filters["status"]
-            if isinstance(status, list):
-                query = query.filter(JobLogs.status.in_(status))
-            else:
-                query = query.filter(JobLogs.status == status)
-        
-        # Job type filter
-        if "job_type" in filters:
-            job_type = filters["job_type"]
-            if isinstance(job_type, list):
-                query = query.filter(JobLogs.job_type.in_(job_type))
-            else:
-                query = query.filter(JobLogs.job_type == job_type)
-        
-        # Table name filter
-        if "table_name" in filters:
-            table_name = filters["table_name"]
-            if isinstance(table_name, list):
-                query = query.filter(JobLogs.table_name.in_(table_name))
-            else:
-                query = query.filter(JobLogs.table_name == table_name)
-        
-        # Schema name filter
-        if "schema_name" in filters:
-            schema_name = filters["schema_name"]
-            if isinstance(schema_name, list):
-                query = query.filter(JobLogs.schema_name.in_(schema_name))
-            else:
-                query = query.filter(JobLogs.schema_name == schema_name)
-        
-        # Source filter
-        if "source" in filters:
-            source = filters["source"]
-            if isinstance(source, list):
-                query = query.filter(JobLogs.source.in_(source))
-            else:
-                query = query.filter(JobLogs.source == source)
-        
-        # ID filter
-        if "id" in filters:
-            job_id = filters["id"]
-            if isinstance(job_id, list):
-                query = query.filter(JobLogs.id.in_(job_id))
-            else:
-                query = query.filter(JobLogs.id == job_id)
+        # Status, job type, table name, schema name, source and ID filters
+        for key, column in _EQ_COLUMNS.items():
+            value = filters.get(key)
+            if value is None:
+                continue
+            query = query.filter(column.in_(value if isinstance(value, (list, tuple)) else (value,)))
         
         # Records affected range
         if "min_records_affected" in filters:
@@ -162,33 +257,12 @@ class JobLogsService:
             query = query.filter(JobLogs.records_affected <= filters["max_records_affected"])
         
         # Date range filters
-        if "started_after" in filters:
-            try:
-                start_date = datetime.fromisoformat(filters["started_after"].replace('Z', '+00:00'))
-                query = query.filter(JobLogs.started_at >= start_date)
-            except ValueError:
-                logger.warning(f"Invalid started_after date format: {filters['started_after']}")
-        
-        if "started_before" in filters:
-            try:
-                end_date = datetime.fromisoformat(filters["started_before"].replace('Z', '+00:00'))
-                query = query.filter(JobLogs.started_at <= end_date)
-            except ValueError:
-                logger.warning(f"Invalid started_before date format: {filters['started_before']}")
-        
-        if "finished_after" in filters:
-            try:
-                start_date = datetime.fromisoformat(filters["finished_after"].replace('Z', '+00:00'))
-                query = query.filter(JobLogs.finished_at >= start_date)
-            except ValueError:
-                logger.warning(f"Invalid finished_after date format: {filters['finished_after']}")
-        
-        if "finished_before" in filters:
-            try:
-                end_date = datetime.fromisoformat(filters["finished_before"].replace('Z', '+00:00'))
-                query = query.filter(JobLogs.finished_at <= end_date)
-            except ValueError:
-                logger.warning(f"Invalid finished_before date format: {filters['finished_before']}")
+        for key, column, compare in _DATE_BOUNDS:
+            if key in filters:
+                try:
+                    query = query.filter(compare(column, _parse_iso(filters[key])))
+                except ValueError:
+                    logger.warning(f"Invalid {key} date format: {filters[key]}")
         
         # Date range shortcuts and natural language parsing
         if "date_range" in filters:
@@ -196,7 +270,7 @@ class JobLogsService:
             
             # Parse natural language expressions like "last 45 min", "last 2 hours"
             # Check for minute expressions: "last X min", "last X minutes"
-            minute_match = re.search(r'last\s+(\d+)\s+min(?:ute)?s?', date_range)
+            minute_match = _LAST_MINUTES_RE.search(date_range)
             if minute_match:
                 minutes = int(minute_match.group(1))
                 cutoff_time = now - timedelta(minutes=minutes)
@@ -204,7 +278,7 @@ class JobLogsService:
                 return query  # Return early to avoid other date range processing
             
             # Check for hour expressions: "last X hour", "last X hours" 
-            hour_match = re.search(r'last\s+(\d+)\s+hours?', date_range)
+            hour_match = _LAST_HOURS_RE.search(date_range)
             if hour_match:
                 hours = int(hour_match.group(1))
                 cutoff_time = now - timedelta(hours=hours)
@@ -263,27 +337,22 @@ class JobLogsService:
             elif date_range.startswith("from_") and "_to_" in date_range:
                 # Handle custom date ranges like "from_9/15/2025_to_9/30/2025"
                 try:
-                    # Extract start and end dates from the filter
-                    parts = date_range.replace("from_", "").split("_to_")
-                    if len(parts) == 2:
-                        start_date_str = parts[0].replace("_", "/")  # Convert 9_15_2025 to 9/15/2025
-                        end_date_str = parts[1].replace("_", "/")    # Convert 9_30_2025 to 9/30/2025
-                        
-                        # Parse the dates
-                        start_date = datetime.strptime(start_date_str, "%m/%d/%Y")
-                        end_date = datetime.strptime(end_date_str, "%m/%d/%Y")
-                        
-                        # Set time boundaries (start of start date to end of end date)
-                        start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                        end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-                        
-                        query = query.filter(
-                            and_(
-                                JobLogs.started_at >= start_date,
-                                JobLogs.started_at <= end_date
-                            )
+                    match = _CUSTOM_RANGE_RE.fullmatch(date_range)
+                    if not match:
+                        raise ValueError("expected from_MM_DD_YYYY_to_MM_DD_YYYY")
+                    start_month, start_day, start_year, end_month, end_day, end_year = map(int, match.groups())
+                    
+                    # Start of start date to end of end date
+                    start_date = datetime(start_year, start_month, start_day)
+                    end_date = datetime(end_year, end_month, end_day, 23, 59, 59, 999999)
+                    
+                    query = query.filter(
+                        and_(
+                            JobLogs.started_at >= start_date,
+                            JobLogs.started_at <= end_date
                         )
-                except (ValueError, IndexError) as e:
+                    )
+                except ValueError as e:
                     logger.warning(f"Failed to parse custom date range '{date_range}': {e}")
         
         # Minute-based filters
@@ -350,53 +419,53 @@ class JobLogsService:
     def get_job_summary_stats(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get summary statistics for job logs"""
         try:
-            # Start with base query
-            query = self.db.query(JobLogs)
-            
-            # Apply filters if provided
-            if filters:
-                query = self._apply_filters(query, filters)
-            
-            # Get various counts
-            total_jobs = query.count()
-            successful_jobs = query.filter(JobLogs.status == "SUCCESS").count()
-            failed_jobs = query.filter(JobLogs.status == "FAILED").count()
-            in_progress_jobs = query.filter(JobLogs.status == "IN_PROGRESS").count()
-            
-            # Get job type breakdown - apply the same filters
-            job_type_query = self.db.query(
+            # Filter once; every statistic below reads this filtered set
+            query = self.db.query(
                 JobLogs.job_type,
-                func.count(JobLogs.id).label('count')
-            )
-            if filters:
-                job_type_query = self._apply_filters(job_type_query, filters)
-            job_type_stats = job_type_query.group_by(JobLogs.job_type).all()
-            
-            # Get table breakdown - apply the same filters
-            table_query = self.db.query(
                 JobLogs.table_name,
-                func.count(JobLogs.id).label('count')
-            )
-            if filters:
-                table_query = self._apply_filters(table_query, filters)
-            table_stats = table_query.group_by(JobLogs.table_name).all()
-            
-            # Get source breakdown - apply the same filters
-            source_query = self.db.query(
                 JobLogs.source,
-                func.count(JobLogs.id).label('count')
+                JobLogs.status,
+                JobLogs.records_affected
             )
             if filters:
-                source_query = self._apply_filters(source_query, filters)
-            source_stats = source_query.group_by(JobLogs.source).all()
+                query = self._apply_filters(query, filters)
+            filtered = query.subquery()
+            
+            # Status counts and records affected stats in a single aggregate pass
+            def status_count(status):
+                return func.coalesce(func.sum(case((filtered.c.status == status, 1), else_=0)), 0)
+            
+            totals = self.db.execute(
+                select(
+                    func.count().label('total_jobs'),
+                    status_count("SUCCESS").label('successful_jobs'),
+                    status_count("FAILED").label('failed_jobs'),
+                    status_count("IN_PROGRESS").label('in_progress_jobs'),
+                    func.sum(filtered.c.records_affected).label('total_records'),
+                    func.avg(filtered.c.records_affected).label('avg_records'),
+                    func.max(filtered.c.records_affected).label('max_records'),
+                    func.min(filtered.c.records_affected).label('min_records')
+                )
+            ).one()
+            total_jobs = int(totals.total_jobs)
+            successful_jobs = int(totals.successful_jobs)
+            failed_jobs = int(totals.failed_jobs)
+            in_progress_jobs = int(totals.in_progress_jobs)
             
-            # Get records affected stats
-            records_stats = query.with_entities(
-                func.sum(JobLogs.records_affected).label('total_records'),
-                func.avg(JobLogs.records_affected).label('avg_records'),
-                func.max(JobLogs.records_affected).label('max_records'),
-                func.min(JobLogs.records_affected).label('min_records')
-            ).first()
+            # Job type, table and source breakdowns in one round trip
+            breakdowns = {'job_type': [], 'table_name': [], 'source': []}
+            breakdown_rows = self.db.execute(
+                union_all(*(
+                    select(
+                        literal(dimension).label('dimension'),
+                        filtered.c[dimension].label('value'),
+                        func.count().label('count')
+                    ).group_by(filtered.c[dimension])
+                    for dimension in breakdowns
+                ))
+            ).all()
+            for row in breakdown_rows:
+                breakdowns[row.dimension].append((row.value, row.count))
             
             return {
                 "success": True,
@@ -407,14 +476,14 @@ class JobLogsService:
                     "in_progress_jobs": in_progress_jobs,
                     "success_rate": round((successful_jobs / total_jobs) * 100, 2) if total_jobs > 0 else 0
                 },
-                "job_types": [{"job_type": jt.job_type, "count": jt.count} for jt in job_type_stats],
-                "tables": [{"table_name": ts.table_name, "count": ts.count} for ts in table_stats],
-                "sources": [{"source": ss.source, "count": ss.count} for ss in source_stats],
+                "job_types": [{"job_type": value, "count": count} for value, count in breakdowns['job_type']],
+                "tables": [{"table_name": value, "count": count} for value, count in breakdowns['table_name']],
+                "sources": [{"source": value, "count": count} for value, count in breakdowns['source']],
                 "records_stats": {
-                    "total_records_affected": int(records_stats.total_records or 0),
-                    "average_records_per_job": round(float(records_stats.avg_records or 0), 2),
-                    "max_records_in_job": int(records_stats.max_records or 0),
-                    "min_records_in_job": int(records_stats.min_records or 0)
+                    "total_records_affected": int(totals.total_records or 0),
+                    "average_records_per_job": round(float(totals.avg_records or 0), 2),
+                    "max_records_in_job": int(totals.max_records or 0),
+                    "min_records_in_job": int(totals.min_records or 0)
                 },
                 "filters_applied": filters or {}
             }
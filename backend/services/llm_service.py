@@ -1339,7 +1339,8 @@ class OpenAIService:
                     filters.get("app_id"),
                     filters.get("period", "last 7 days"),
                     filters.get("has_errors_only", False),
-                    filters.get("limit", 100)
+                    filters.get("limit", 100),
+                    include_total=True
                 )
             else:
                 # For operations requiring more parameters, return a helpful message
@@ -1836,3 +1837,15 @@ class OpenAIService:
         return tables[0] if tables else None
 
 
+
+
+# Global LLM service instance (created on first use so a missing API key
+# is only reported when the LLM is actually needed)
+_llm_service: Optional[OpenAIService] = None
+
+def get_llm_service() -> OpenAIService:
+    """Get the global LLM service instance"""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = OpenAIService()
+    return _llm_service
@@ -89,6 +89,8 @@ class RegionService:
                 database_url,
                 pool_pre_ping=True,
                 pool_recycle=3600,
+                # Room for every archive/stats statement shape in the compiled SQL cache
+                query_cache_size=1200,
                 echo=False
             )
             
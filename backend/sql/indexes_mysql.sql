@@ -0,0 +1,37 @@
+-- Indexes declared on the models, for databases whose tables already existed.
+--
+-- main.py only runs Base.metadata.create_all(), which creates indexes together with
+-- new tables and never adds them to existing ones. Run this once against an existing
+-- MySQL or MariaDB schema:
+--
+--   mysql --force -u <user> -p <database> < backend/sql/indexes_mysql.sql
+--
+-- MySQL has no CREATE INDEX IF NOT EXISTS, so a statement whose index is already
+-- present fails with "Duplicate key name"; --force skips it and continues.
+-- InnoDB builds these online (ALGORITHM=INPLACE, LOCK=NONE), so reads and writes
+-- carry on while they are created.
+
+-- dsitransactionlog / dsitransactionlogarchive: time-range DSI stats queries
+CREATE INDEX ix_dsitransactionlog_when_received
+    ON dsitransactionlog (WhenReceived) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX ix_dsitransactionlog_device_when
+    ON dsitransactionlog (DeviceID, WhenReceived) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX ix_dsitransactionlog_device_user_when
+    ON dsitransactionlog (DeviceID, UserID, WhenReceived) ALGORITHM=INPLACE LOCK=NONE;
+
+CREATE INDEX ix_dsitransactionlogarchive_when_received
+    ON dsitransactionlogarchive (WhenReceived) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX ix_dsitransactionlogarchive_device_when
+    ON dsitransactionlogarchive (DeviceID, WhenReceived) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX ix_dsitransactionlogarchive_device_user_when
+    ON dsitransactionlogarchive (DeviceID, UserID, WhenReceived) ALGORITHM=INPLACE LOCK=NONE;
+
+-- dsiactivitiesarchive: (ActivityID, PostedTime) duplicate check when archiving
+CREATE INDEX ix_dsiactivitiesarchive_activity_posted
+    ON dsiactivitiesarchive (ActivityID, PostedTime) ALGORITHM=INPLACE LOCK=NONE;
+
+-- job_logs: newest-first listings / keyset cursors, and status filters
+CREATE INDEX ix_job_logs_started_id
+    ON job_logs (started_at, id) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX ix_job_logs_status_started
+    ON job_logs (status, started_at) ALGORITHM=INPLACE LOCK=NONE;
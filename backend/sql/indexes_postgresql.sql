@@ -0,0 +1,43 @@
+-- Indexes declared on the models, for databases whose tables already existed.
+--
+-- main.py only runs Base.metadata.create_all(), which creates indexes together with
+-- new tables and never adds them to existing ones. Run this once against an existing
+-- Postgres schema (outside a transaction, which CONCURRENTLY requires):
+--
+--   psql -d <database> -f backend/sql/indexes_postgresql.sql
+--
+-- Every statement is IF NOT EXISTS, so re-running it is safe. CONCURRENTLY keeps the
+-- tables writable while each index builds. The CamelCase column names are quoted
+-- because the models create them case-sensitively.
+
+-- dsitransactionlog / dsitransactionlogarchive: time-range DSI stats queries
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dsitransactionlog_when_received
+    ON dsitransactionlog ("WhenReceived");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dsitransactionlog_device_when
+    ON dsitransactionlog ("DeviceID", "WhenReceived");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dsitransactionlog_device_user_when
+    ON dsitransactionlog ("DeviceID", "UserID", "WhenReceived");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dsitransactionlogarchive_when_received
+    ON dsitransactionlogarchive ("WhenReceived");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dsitransactionlogarchive_device_when
+    ON dsitransactionlogarchive ("DeviceID", "WhenReceived");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dsitransactionlogarchive_device_user_when
+    ON dsitransactionlogarchive ("DeviceID", "UserID", "WhenReceived");
+
+-- dsiactivitiesarchive: (ActivityID, PostedTime) duplicate check when archiving
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dsiactivitiesarchive_activity_posted
+    ON dsiactivitiesarchive ("ActivityID", "PostedTime");
+
+-- job_logs: newest-first listings / keyset cursors, and status filters
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_job_logs_started_id
+    ON job_logs (started_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_job_logs_status_started
+    ON job_logs (status, started_at);
+
+-- job_logs: trigram index for reason_contains (ILIKE '%term%'). Creating the
+-- extension needs a role allowed to do so; without pg_trgm the operator class does
+-- not exist and this index fails, while the rest of the script still applies.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_job_logs_reason_trgm
+    ON job_logs USING gin (reason gin_trgm_ops);
@@ -1049,13 +1049,14 @@ const StructuredContentRenderer: React.FC<StructuredContentProps> = ({
                         fontSize: "1.0rem",
                       }}
                     >
+                      {table.total_is_estimate ? "~" : ""}
                       {table.total_records?.toLocaleString() || "0"}
                     </Typography>
                     <Typography
                       variant="caption"
                       sx={{ color: "#64748b", fontSize: "0.65rem" }}
                     >
-                      Total records
+                      {table.total_is_estimate ? "Estimated total records" : "Total records"}
                     </Typography>
                   </Box>
                 </Box>
@@ -1137,13 +1138,14 @@ const StructuredContentRenderer: React.FC<StructuredContentProps> = ({
                         fontSize: "1.0rem",
                       }}
                     >
+                      {table.total_is_estimate ? "~" : ""}
                       {table.total_records?.toLocaleString() || "0"}
                     </Typography>
                     <Typography
                       variant="caption"
                       sx={{ color: "#64748b", fontSize: "0.65rem" }}
                     >
-                      Total records
+                      {table.total_is_estimate ? "Estimated total records" : "Total records"}
                     </Typography>
                   </Box>
                 </Box>
@@ -1546,7 +1548,11 @@ const StructuredContentRenderer: React.FC<StructuredContentProps> = ({
           )}
           {data.data?.total_logs !== undefined && (
             <Chip
-              label={`Total Logs: ${data.data.total_logs}`}
+              label={
+                data.data.total_matched !== undefined
+                  ? `Total Logs: ${data.data.total_logs} of ${data.data.total_matched}`
+                  : `Total Logs: ${data.data.total_logs}`
+              }
               size="small"
               sx={{ mr: 1, mb: 1, backgroundColor: "#f3f4f6", color: "#374151" }}
             />